@@ -13,6 +13,18 @@ class PGVectorConfig(BaseModel):
     port: Optional[int] = Field(None, description="Database port. Default is 1536")
     diskann: Optional[bool] = Field(False, description="Use diskann for approximate nearest neighbors search")
     hnsw: Optional[bool] = Field(True, description="Use hnsw for faster search")
+    ivfflat: Optional[bool] = Field(False, description="Use an IVFFlat index instead of HNSW (faster to build, for large bulk-loaded collections). Built by PGVector.create_ivfflat_index() after loading")
+    ivfflat_lists: Optional[int] = Field(None, description="Number of IVFFlat lists. Defaults to rows / 1000 up to 1M rows and sqrt(rows) beyond, sized when the index is built")
+    ivfflat_probes: Optional[int] = Field(None, description="IVFFlat lists probed by each search. Defaults to sqrt(lists)")
+    hnsw_m: Optional[int] = Field(16, description="HNSW M parameter (max connections per node)")
+    hnsw_ef_construction: Optional[int] = Field(64, description="HNSW ef_construction parameter (candidate list size during index build)")
+    hnsw_ef_search: Optional[int] = Field(None, description="HNSW ef_search parameter (candidate list size during search). Defaults to the server setting")
+    storage_type: Optional[str] = Field("vector", description="Column type used to store vectors: 'vector' (float32) or 'halfvec' (float16, half the storage)")
+    query_cache_size: Optional[int] = Field(0, description="Number of recent searches kept in an in-process semantic cache (0 disables it)")
+    query_cache_threshold: Optional[float] = Field(0.99, description="Minimum cosine similarity between query vectors for a semantic cache hit")
+    query_cache_max_age: Optional[float] = Field(None, description="Seconds a cached search result may be reused. Defaults to no limit (until the next local write)")
+    maintenance_work_mem: Optional[str] = Field("2GB", description="maintenance_work_mem used while building vector indexes")
+    max_parallel_maintenance_workers: Optional[int] = Field(None, description="Parallel workers used while building vector indexes. Defaults to one less than the number of CPUs")
     minconn: Optional[int] = Field(1, description="Minimum number of connections in the pool")
     maxconn: Optional[int] = Field(5, description="Maximum number of connections in the pool")
     # New SSL and connection options
@@ -1,24 +1,48 @@
+import atexit
+import hashlib
 import json
 import logging
-from contextlib import contextmanager
-from typing import Any, List, Optional
+import math
+import os
+import re
+import threading
+import time
+import weakref
+from contextlib import contextmanager, nullcontext
+from typing import Any, Iterator, List, Optional
 
+import numpy as np
 from pydantic import BaseModel
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Try to import psycopg (psycopg3) first, then fall back to psycopg2
 try:
+    from psycopg import Pipeline, sql
     from psycopg.types.json import Json
     from psycopg_pool import ConnectionPool
     PSYCOPG_VERSION = 3
     logger = logging.getLogger(__name__)
     logger.info("Using psycopg (psycopg3) with ConnectionPool for PostgreSQL connections")
+    try:
+        from pgvector.psycopg import register_vector
+    except ImportError:
+        register_vector = None
 except ImportError:
     try:
+        from psycopg2 import sql
         from psycopg2.extras import Json, execute_values
         from psycopg2.pool import ThreadedConnectionPool as ConnectionPool
         PSYCOPG_VERSION = 2
         logger = logging.getLogger(__name__)
         logger.info("Using psycopg2 with ThreadedConnectionPool for PostgreSQL connections")
+        try:
+            from pgvector.psycopg2 import register_vector
+        except ImportError:
+            register_vector = None
     except ImportError:
         raise ImportError(
             "Neither 'psycopg' nor 'psycopg2' library is available. "
@@ -30,10 +54,156 @@ from mem0.vector_stores.base import VectorStoreBase
 logger = logging.getLogger(__name__)
 
 
+# PGVector instances whose pool is still open, held weakly so they can still be collected
+_open_stores = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_stores() -> None:
+    """Close the PGVector instances that are still open at interpreter shutdown."""
+    for store in list(_open_stores):
+        try:
+            store.close()
+        except Exception:
+            logger.debug("Failed to close PGVector connection pool at exit", exc_info=True)
+
+
 class OutputData(BaseModel):
     id: Optional[str]
     score: Optional[float]
     payload: Optional[dict]
+    vector: Optional[List[float]] = None
+
+
+class SemanticQueryCache:
+    """
+    In-process cache of search results keyed on the query embedding.
+
+    A lookup hits when a cached query has cosine similarity >= threshold with the new query,
+    was run with the same limit and filters and, if max_age is set, was cached at most max_age
+    seconds ago. Entries are evicted least recently used first.
+
+    Every clear() starts a new generation. Callers read `generation` before querying the database
+    and pass it to put(), so results read before a concurrent write are not cached after it.
+    """
+
+    def __init__(self, max_size: int, threshold: Optional[float] = 0.99, max_age: Optional[float] = None):
+        self.max_size = max_size
+        self.threshold = threshold if threshold is not None else 0.99
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self.generation = 0
+        self.clear()
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        with self._lock:
+            self.generation += 1
+            self._keys = None  # (max_size, dims) unit-normalized query vectors
+            self._scope_ids = np.full(self.max_size, -1, dtype=np.int64)
+            self._last_used = np.zeros(self.max_size, dtype=np.int64)
+            self._stored_at = np.zeros(self.max_size, dtype=np.float64)  # time.monotonic() of each put
+            self._values = [None] * self.max_size
+            self._reset_scopes()
+            self._size = 0
+            self._clock = 0
+
+    def _reset_scopes(self) -> None:
+        self._scopes = {}  # (limit, filters) -> [scope id, number of slots using it]
+        self._scope_keys = {}  # scope id -> (limit, filters)
+        self._next_scope_id = 0
+
+    @staticmethod
+    def _normalize(vector: list[float]) -> Optional[np.ndarray]:
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm == 0:
+            return None
+        return vector / norm
+
+    @staticmethod
+    def _scope_key(limit: Optional[int], filters: Optional[dict]) -> tuple:
+        return (limit, json.dumps(filters, sort_keys=True, default=str) if filters else None)
+
+    def _acquire_scope(self, scope: tuple) -> int:
+        """Return the id of a scope, registering it, and count one more slot using it."""
+        entry = self._scopes.get(scope)
+        if entry is None:
+            entry = self._scopes[scope] = [self._next_scope_id, 0]
+            self._scope_keys[self._next_scope_id] = scope
+            self._next_scope_id += 1
+        entry[1] += 1
+        return entry[0]
+
+    def _release_scope(self, scope_id: int) -> None:
+        """Count one less slot using a scope, forgetting the scope once no slot uses it."""
+        scope = self._scope_keys.get(scope_id)
+        if scope is None:
+            return
+        entry = self._scopes[scope]
+        entry[1] -= 1
+        if entry[1] == 0:
+            del self._scopes[scope]
+            del self._scope_keys[scope_id]
+
+    def get(self, vector: list[float], limit: Optional[int], filters: Optional[dict]) -> Optional[List["OutputData"]]:
+        """Return the cached results of a similar enough query, or None."""
+        query = self._normalize(vector)
+        if query is None:
+            return None
+        with self._lock:
+            if self._size == 0 or self._keys.shape[1] != query.shape[0]:
+                return None
+            # Unknown scopes have no cached entries; looking them up must not register them
+            entry = self._scopes.get(self._scope_key(limit, filters))
+            if entry is None:
+                return None
+            scores = self._keys[: self._size] @ query
+            scores[self._scope_ids[: self._size] != entry[0]] = -np.inf
+            if self.max_age:
+                scores[time.monotonic() - self._stored_at[: self._size] > self.max_age] = -np.inf
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                return None
+            self._clock += 1
+            self._last_used[best] = self._clock
+            return list(self._values[best])
+
+    def put(
+        self,
+        vector: list[float],
+        limit: Optional[int],
+        filters: Optional[dict],
+        results: List["OutputData"],
+        generation: Optional[int] = None,
+    ) -> None:
+        """
+        Cache the results of a query, evicting the least recently used entry when full.
+        The results are dropped if the cache was cleared since `generation` was read.
+        """
+        query = self._normalize(vector)
+        if query is None:
+            return
+        with self._lock:
+            if generation is not None and generation != self.generation:
+                return
+            if self._keys is None or self._keys.shape[1] != query.shape[0]:
+                self._keys = np.zeros((self.max_size, query.shape[0]), dtype=np.float32)
+                self._scope_ids[:] = -1
+                self._reset_scopes()
+                self._size = 0
+            if self._size < self.max_size:
+                slot = self._size
+                self._size += 1
+            else:
+                slot = int(np.argmin(self._last_used))
+                self._release_scope(int(self._scope_ids[slot]))
+            self._clock += 1
+            self._keys[slot] = query
+            self._scope_ids[slot] = self._acquire_scope(self._scope_key(limit, filters))
+            self._last_used[slot] = self._clock
+            self._stored_at[slot] = time.monotonic()
+            self._values[slot] = list(results)
 
 
 class PGVector(VectorStoreBase):
@@ -53,6 +223,18 @@ class PGVector(VectorStoreBase):
         sslmode=None,
         connection_string=None,
         connection_pool=None,
+        hnsw_m=16,
+        hnsw_ef_construction=64,
+        hnsw_ef_search=None,
+        storage_type="vector",
+        query_cache_size=0,
+        query_cache_threshold=0.99,
+        query_cache_max_age=None,
+        maintenance_work_mem="2GB",
+        max_parallel_maintenance_workers=None,
+        ivfflat=False,
+        ivfflat_lists=None,
+        ivfflat_probes=None,
     ):
         """
         Initialize the PGVector database.
@@ -72,12 +254,66 @@ class PGVector(VectorStoreBase):
             sslmode (str, optional): SSL mode for PostgreSQL connection (e.g., 'require', 'prefer', 'disable')
             connection_string (str, optional): PostgreSQL connection string (overrides individual connection parameters)
             connection_pool (Any, optional): psycopg2 connection pool object (overrides connection string and individual parameters)
+            hnsw_m (int): HNSW M parameter (connections per node). Defaults to 16.
+            hnsw_ef_construction (int): HNSW ef_construction parameter (candidate list size while building). Defaults to 64.
+            hnsw_ef_search (int, optional): HNSW ef_search parameter applied to each search. Defaults to the server setting.
+            storage_type (str): Column type used to store vectors, 'vector' (float32) or 'halfvec' (float16). Defaults to 'vector'.
+            query_cache_size (int): Number of recent searches to keep in an in-process semantic cache. Defaults to 0 (disabled).
+            query_cache_threshold (float): Minimum cosine similarity between query vectors for a cache hit. Defaults to 0.99.
+            query_cache_max_age (float, optional): Seconds a cached search result may be reused, bounding how stale
+                results can get after writes from other processes. Defaults to None (until the next local write).
+            maintenance_work_mem (str, optional): maintenance_work_mem used while building vector indexes. Defaults to '2GB'.
+            max_parallel_maintenance_workers (int, optional): Parallel workers used while building vector indexes.
+                Defaults to one less than the number of CPUs.
+            ivfflat (bool, optional): Use an IVFFlat index instead of HNSW. Builds much faster and uses less memory,
+                which suits large bulk-loaded collections. The index is built by create_ivfflat_index() once
+                the collection is loaded. Defaults to False.
+            ivfflat_lists (int, optional): Number of IVFFlat lists. Defaults to sizing from the row count
+                when the index is built.
+            ivfflat_probes (int, optional): Lists probed by each search. Defaults to sqrt(lists).
         """
+        if storage_type not in ("vector", "halfvec"):
+            raise ValueError(f"Invalid storage_type: {storage_type}. Must be 'vector' or 'halfvec'")
+
         self.collection_name = collection_name
         self.use_diskann = diskann
         self.use_hnsw = hnsw
+        self.use_ivfflat = ivfflat
+        # The vector index actually used, by priority: diskann > ivfflat > hnsw
+        if diskann and embedding_model_dims < 2000:
+            self.index_type = "diskann"
+        elif ivfflat:
+            self.index_type = "ivfflat"
+        elif hnsw:
+            self.index_type = "hnsw"
+        else:
+            self.index_type = None
+        self.ivfflat_lists = ivfflat_lists
+        # Derived from the lists of the built index unless set explicitly
+        self._derive_ivfflat_probes = ivfflat_probes is None
+        if self._derive_ivfflat_probes and self.index_type == "ivfflat" and ivfflat_lists is not None:
+            ivfflat_probes = self._default_ivfflat_probes(ivfflat_lists)
+        self.ivfflat_probes = ivfflat_probes
+        self.hnsw_m = hnsw_m if hnsw_m is not None else 16
+        self.hnsw_ef_construction = hnsw_ef_construction if hnsw_ef_construction is not None else 64
+        self.hnsw_ef_search = hnsw_ef_search
+        self.storage_type = storage_type
+        self.maintenance_work_mem = maintenance_work_mem
+        if max_parallel_maintenance_workers is None:
+            max_parallel_maintenance_workers = max((os.cpu_count() or 1) - 1, 0)
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+        self.query_cache = (
+            SemanticQueryCache(query_cache_size, query_cache_threshold, query_cache_max_age) if query_cache_size else None
+        )
         self.embedding_model_dims = embedding_model_dims
+        # Postgres folds unquoted names to lower case, so quote the folded name to keep
+        # resolving to the same table as the previously unquoted SQL did
+        self._table_name = collection_name.lower()
+        self._table = sql.Identifier(self._table_name)
+        self._build_statements()
         self.connection_pool = None
+        # Connections that already have the pgvector type adapters registered
+        self._vector_registered_conns = weakref.WeakSet()
 
         # Connection setup with priority: connection_pool > connection_string > individual parameters
         if connection_pool is not None:
@@ -88,7 +324,6 @@ class PGVector(VectorStoreBase):
                 # Append sslmode to connection string if provided
                 if 'sslmode=' in connection_string:
                     # Replace existing sslmode
-                    import re
                     connection_string = re.sub(r'sslmode=[^ ]*', f'sslmode={sslmode}', connection_string)
                 else:
                     # Add sslmode to connection string
@@ -105,21 +340,28 @@ class PGVector(VectorStoreBase):
             else:
                 # psycopg2 ThreadedConnectionPool
                 self.connection_pool = ConnectionPool(minconn=minconn, maxconn=maxconn, dsn=connection_string)
+        self._closed = False
+        _open_stores.add(self)
 
+        self._prepare_extensions()
         collections = self.list_cols()
-        if collection_name not in collections:
+        if self._table_name not in collections:
             self.create_col()
+        elif self.index_type == "ivfflat" and self.ivfflat_probes is None:
+            self._load_ivfflat_probes()
 
     @contextmanager
-    def _get_cursor(self, commit: bool = False):
+    def _get_cursor(self, commit: bool = False, name: Optional[str] = None):
         """
         Unified context manager to get a cursor from the appropriate pool.
         Auto-commits or rolls back based on exception, and returns the connection to the pool.
+        Passing a name opens a server-side cursor, which fetches rows in batches of `itersize`.
         """
         if PSYCOPG_VERSION == 3:
             # psycopg3 auto-manages commit/rollback and pool return
             with self.connection_pool.connection() as conn:
-                with conn.cursor() as cur:
+                self._register_vector_types(conn)
+                with conn.cursor(name=name) if name else conn.cursor() as cur:
                     try:
                         yield cur
                         if commit:
@@ -131,7 +373,8 @@ class PGVector(VectorStoreBase):
         else:
             # psycopg2 manual getconn/putconn
             conn = self.connection_pool.getconn()
-            cur = conn.cursor()
+            self._register_vector_types(conn)
+            cur = conn.cursor(name=name) if name else conn.cursor()
             try:
                 yield cur
                 if commit:
@@ -144,60 +387,348 @@ class PGVector(VectorStoreBase):
                 cur.close()
                 self.connection_pool.putconn(conn)
 
+    def _build_statements(self) -> None:
+        """
+        Build the fixed SQL statements once, so every call sends the same query text
+        and psycopg can reuse the server-side prepared statement.
+        """
+        self._sql_get = sql.SQL("SELECT id, payload FROM {table} WHERE id = %s").format(table=self._table)
+        self._sql_get_with_vector = sql.SQL("SELECT id, vector, payload FROM {table} WHERE id = %s").format(
+            table=self._table
+        )
+        self._sql_delete = sql.SQL("DELETE FROM {table} WHERE id = %s").format(table=self._table)
+        self._sql_update_vector = sql.SQL("UPDATE {table} SET vector = %s WHERE id = %s").format(table=self._table)
+        self._sql_update_payload = sql.SQL("UPDATE {table} SET payload = %s WHERE id = %s").format(table=self._table)
+        self._sql_update_vector_payload = sql.SQL("UPDATE {table} SET vector = %s, payload = %s WHERE id = %s").format(
+            table=self._table
+        )
+
+    def _index(self, suffix: str):
+        """Quoted name of one of the collection's indexes."""
+        return sql.Identifier(f"{self._table_name}_{suffix}")
+
+    @staticmethod
+    def _execute(cur, query, params=None, binary: bool = False) -> None:
+        """
+        Execute a query, preparing it server-side on first use with psycopg3 so repeated
+        calls skip parsing and planning. psycopg2 has no prepared statement support.
+        With binary=True psycopg3 receives the results in binary format, so numeric
+        columns arrive as raw IEEE values instead of text to be parsed.
+        """
+        if PSYCOPG_VERSION == 3:
+            cur.execute(query, params, prepare=True, binary=binary)
+        else:
+            cur.execute(query, params)
+
+    @staticmethod
+    def _pipeline(cur):
+        """
+        Send the statements executed inside the block in a single roundtrip.
+        Requires psycopg3 with libpq >= 14; a no-op otherwise.
+        """
+        if PSYCOPG_VERSION == 3 and Pipeline.is_supported():
+            return cur.connection.pipeline()
+        return nullcontext()
+
+    def _register_vector_types(self, conn) -> None:
+        """
+        Register the pgvector type adapters on a connection, once per connection.
+        This lets vectors be sent as numpy arrays in pgvector's own wire format instead
+        of Python lists that are rendered as text and parsed again by the server.
+        """
+        if register_vector is None or conn in self._vector_registered_conns:
+            return
+        try:
+            register_vector(conn)
+        except Exception as e:
+            # The vector type does not exist until the extension has been created
+            logger.debug(f"Could not register pgvector types on connection: {e}")
+            return
+        self._vector_registered_conns.add(conn)
+
+    @staticmethod
+    def _vector_param(vector: list[float]) -> Any:
+        """
+        Adapt a vector for binding as a query parameter.
+        Uses a float32 numpy array when the pgvector adapters are available.
+        """
+        if register_vector is None:
+            return vector
+        return np.asarray(vector, dtype=np.float32)
+
     def create_col(self) -> None:
         """
         Create a new collection (table in PostgreSQL).
         Will also initialize vector search index if specified.
         """
         with self._get_cursor(commit=True) as cur:
-            cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
-            cur.execute(
-                f"""
-                CREATE TABLE IF NOT EXISTS {self.collection_name} (
+            self._create_col(cur)
+
+    def _prepare_extensions(self) -> None:
+        """
+        Make sure the vector extension is installed, once per instance rather than on every
+        collection creation, and record whether vectorscale (DiskANN) is installed and
+        which pgvector version is.
+        """
+        with self._get_cursor(commit=True) as cur:
+            cur.execute("SELECT extname, extversion FROM pg_extension WHERE extname IN ('vector', 'vectorscale')")
+            installed = {name: version for name, version in cur.fetchall()}
+            # Only issue DDL when needed: CREATE EXTENSION is rejected on hot standbys and in
+            # read-only transactions even when the extension already exists
+            if "vector" not in installed:
+                cur.execute("CREATE EXTENSION IF NOT EXISTS vector")
+                cur.execute("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                row = cur.fetchone()
+                installed["vector"] = row[0] if row else None
+        self.has_vectorscale = "vectorscale" in installed
+        self.pgvector_version = self._parse_version(installed["vector"])
+
+    @staticmethod
+    def _parse_version(version: Optional[str]) -> Optional[tuple]:
+        """Parse an extension version such as '0.8.0' into (0, 8), or None if unknown."""
+        match = re.match(r"(\d+)\.(\d+)", version) if isinstance(version, str) else None
+        return (int(match.group(1)), int(match.group(2))) if match else None
+
+    @staticmethod
+    @contextmanager
+    def _transaction(cur):
+        """
+        Run the block in an explicit transaction, so transaction-scoped settings
+        (set_config(..., true)) also apply on autocommit connections.
+        """
+        if PSYCOPG_VERSION == 3:
+            with cur.connection.transaction():
+                yield
+        elif cur.connection.autocommit is True:
+            # Switch the connection itself rather than executing BEGIN, which a named
+            # (server-side) cursor could not run
+            conn = cur.connection
+            conn.autocommit = False
+            try:
+                yield
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            finally:
+                conn.autocommit = True
+        else:
+            # psycopg2 already opened a transaction, committed or rolled back by _get_cursor
+            yield
+
+    def _create_col(self, cur) -> None:
+        """Execute the DDL creating the collection table and its indexes on the given cursor."""
+        cur.execute(
+            sql.SQL(
+                """
+                CREATE TABLE IF NOT EXISTS {table} (
                     id UUID PRIMARY KEY,
-                    vector vector({self.embedding_model_dims}),
+                    vector {vector_type}({dims}),
                     payload JSONB
                 );
                 """
+            ).format(
+                table=self._table,
+                vector_type=sql.SQL(self.storage_type),
+                dims=sql.Literal(int(self.embedding_model_dims)),
             )
-            if self.use_diskann and self.embedding_model_dims < 2000:
-                cur.execute("SELECT * FROM pg_extension WHERE extname = 'vectorscale'")
-                if cur.fetchone():
-                    # Create DiskANN index if extension is installed for faster search
-                    cur.execute(
-                        f"""
-                        CREATE INDEX IF NOT EXISTS {self.collection_name}_diskann_idx
-                        ON {self.collection_name}
+        )
+        if self.index_type == "diskann":
+            if self.has_vectorscale:
+                # Create DiskANN index if extension is installed for faster search
+                self._set_index_build_settings(cur)
+                cur.execute(
+                    sql.SQL(
+                        """
+                        CREATE INDEX IF NOT EXISTS {index}
+                        ON {table}
                         USING diskann (vector);
                         """
-                    )
-            elif self.use_hnsw:
-                cur.execute(
-                    f"""
-                    CREATE INDEX IF NOT EXISTS {self.collection_name}_hnsw_idx
-                    ON {self.collection_name}
-                    USING hnsw (vector vector_cosine_ops)
+                    ).format(index=self._index("diskann_idx"), table=self._table)
+                )
+        # No IVFFlat index here: it picks its list centroids from the rows present at build time,
+        # so on an empty table they would be random; create_ivfflat_index() builds it after loading
+        elif self.index_type == "hnsw":
+            self._set_index_build_settings(cur)
+            cur.execute(
+                sql.SQL(
+                    """
+                    CREATE INDEX IF NOT EXISTS {index}
+                    ON {table}
+                    USING hnsw (vector {opclass})
+                    WITH (m = {m}, ef_construction = {ef_construction})
+                    """
+                ).format(
+                    index=self._index("hnsw_idx"),
+                    table=self._table,
+                    opclass=sql.SQL(f"{self.storage_type}_cosine_ops"),
+                    m=sql.Literal(int(self.hnsw_m)),
+                    ef_construction=sql.Literal(int(self.hnsw_ef_construction)),
+                )
+            )
+        # Index-backed payload containment lookups for metadata-only queries
+        cur.execute(
+            sql.SQL(
+                """
+                CREATE INDEX IF NOT EXISTS {index}
+                ON {table}
+                USING gin (payload jsonb_path_ops)
+                """
+            ).format(index=self._index("payload_gin_idx"), table=self._table)
+        )
+
+    def _set_index_build_settings(self, cur) -> None:
+        """
+        Raise the memory and parallel worker limits for the vector index build in the current
+        transaction, so pgvector can build the graph in memory with parallel workers.
+        """
+        if self.maintenance_work_mem:
+            cur.execute("SELECT set_config('maintenance_work_mem', %s, true)", (str(self.maintenance_work_mem),))
+        if self.max_parallel_maintenance_workers is not None:
+            cur.execute(
+                "SELECT set_config('max_parallel_maintenance_workers', %s, true)",
+                (str(int(self.max_parallel_maintenance_workers)),),
+            )
+
+    def create_ivfflat_index(self, lists: Optional[int] = None) -> None:
+        """
+        Build the IVFFlat index, replacing any existing one. Call it once the collection has been
+        bulk-loaded (and again after it has grown substantially): IVFFlat computes its list
+        centroids from the rows present when it is built, so an index built on an empty or small
+        table gives low recall.
+
+        Args:
+            lists (int, optional): Number of lists. Defaults to ivfflat_lists, or when that is unset
+                to rows / 1000 for up to 1M rows and sqrt(rows) beyond.
+        """
+        if lists is None:
+            lists = self.ivfflat_lists
+        with self._get_cursor(commit=True) as cur:
+            if lists is None:
+                cur.execute(sql.SQL("SELECT COUNT(*) FROM {table}").format(table=self._table))
+                rows = cur.fetchone()[0]
+                lists = rows // 1000 if rows <= 1_000_000 else round(math.sqrt(rows))
+            lists = max(1, int(lists))
+            self._set_index_build_settings(cur)
+            cur.execute(sql.SQL("DROP INDEX IF EXISTS {index}").format(index=self._index("ivfflat_idx")))
+            cur.execute(
+                sql.SQL(
+                    """
+                    CREATE INDEX {index}
+                    ON {table}
+                    USING ivfflat (vector {opclass})
+                    WITH (lists = {lists})
+                    """
+                ).format(
+                    index=self._index("ivfflat_idx"),
+                    table=self._table,
+                    opclass=sql.SQL(f"{self.storage_type}_cosine_ops"),
+                    lists=sql.Literal(lists),
+                )
+            )
+        if self._derive_ivfflat_probes:
+            self.ivfflat_probes = self._default_ivfflat_probes(lists)
+
+    @staticmethod
+    def _default_ivfflat_probes(lists: int) -> int:
+        return max(1, round(math.sqrt(lists)))
+
+    def _load_ivfflat_probes(self) -> None:
+        """Derive the default probes from the lists of an existing IVFFlat index, if there is one."""
+        with self._get_cursor() as cur:
+            cur.execute(
+                "SELECT reloptions FROM pg_class WHERE relkind = 'i' AND relname = %s",
+                (f"{self._table_name}_ivfflat_idx",),
+            )
+            row = cur.fetchone()
+        options = row[0] if row and isinstance(row[0], (list, tuple)) else []
+        for option in options:
+            name, _, value = str(option).partition("=")
+            if name == "lists" and value.isdigit():
+                self.ivfflat_probes = self._default_ivfflat_probes(int(value))
+
+    def create_partial_index(self, key: str, value: Any) -> None:
+        """
+        Create a partial HNSW index covering only the vectors whose payload contains {key: value}.
+        Searches filtered on that key/value pair can then walk the much smaller partial
+        index instead of filtering the results of the full one (e.g. one index per tenant).
+
+        Args:
+            key (str): Payload key to index on (e.g. 'user_id').
+            value (Any): Payload value the index is restricted to.
+        """
+        predicate = json.dumps({key: value})
+        digest = hashlib.md5(predicate.encode()).hexdigest()[:12]
+        index_name = f"{self._table_name}_hnsw_{digest}_idx"
+        if len(index_name.encode()) > 63:
+            # Postgres truncates identifiers to 63 bytes, which would cut off the digest and make
+            # different predicates collide; hash the whole name instead
+            index_name = f"hnsw_{hashlib.md5(index_name.encode()).hexdigest()}_idx"
+        with self._get_cursor(commit=True) as cur:
+            self._set_index_build_settings(cur)
+            cur.execute(
+                sql.SQL(
+                    """
+                    CREATE INDEX IF NOT EXISTS {index}
+                    ON {table}
+                    USING hnsw (vector {opclass})
+                    WITH (m = {m}, ef_construction = {ef_construction})
+                    WHERE payload @> {predicate}::jsonb
                     """
+                ).format(
+                    index=sql.Identifier(index_name),
+                    table=self._table,
+                    opclass=sql.SQL(f"{self.storage_type}_cosine_ops"),
+                    m=sql.Literal(int(self.hnsw_m)),
+                    ef_construction=sql.Literal(int(self.hnsw_ef_construction)),
+                    predicate=sql.Literal(predicate),
                 )
+            )
 
     def insert(self, vectors: list[list[float]], payloads=None, ids=None) -> None:
         logger.info(f"Inserting {len(vectors)} vectors into collection {self.collection_name}")
-        json_payloads = [json.dumps(payload) for payload in payloads]
+        json_payloads = [self._dumps_json(payload) for payload in payloads]
 
-        data = [(id, vector, payload) for id, vector, payload in zip(ids, vectors, json_payloads)]
         if PSYCOPG_VERSION == 3:
+            # Stream the whole batch in a single COPY instead of one INSERT roundtrip per row
             with self._get_cursor(commit=True) as cur:
-                cur.executemany(
-                    f"INSERT INTO {self.collection_name} (id, vector, payload) VALUES (%s, %s, %s)",
-                    data,
-                )
+                with cur.copy(sql.SQL("COPY {table} (id, vector, payload) FROM STDIN").format(table=self._table)) as copy:
+                    for id, vector, payload in zip(ids, vectors, json_payloads):
+                        copy.write_row((id, self._format_vector(vector), payload))
         else:
+            data = [(id, vector, payload) for id, vector, payload in zip(ids, vectors, json_payloads)]
             with self._get_cursor(commit=True) as cur:
                 execute_values(
                     cur,
-                    f"INSERT INTO {self.collection_name} (id, vector, payload) VALUES %s",
+                    sql.SQL("INSERT INTO {table} (id, vector, payload) VALUES %s").format(table=self._table),
                     data,
+                    page_size=max(len(data), 1),
                 )
+        self._invalidate_query_cache()
+
+    @staticmethod
+    def _dumps_json(obj: Any) -> str:
+        """Serialize a payload to JSON text, using orjson when it is installed."""
+        if orjson is not None:
+            try:
+                return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).decode()
+            except TypeError:
+                # orjson rejects some values json accepts, e.g. integers wider than 64 bits
+                pass
+        return json.dumps(obj)
+
+    @classmethod
+    def _json(cls, obj: Any) -> Any:
+        """Wrap a payload for binding as a JSON parameter, serialized with _dumps_json."""
+        return Json(obj, dumps=cls._dumps_json)
+
+    @staticmethod
+    def _format_vector(vector: list[float]) -> str:
+        """
+        Format a vector as a pgvector text literal (e.g. '[0.1,0.2,0.3]').
+        Used for COPY, where lists would otherwise be written as Postgres arrays.
+        """
+        return "[" + ",".join(str(float(v)) for v in vector) + "]"
 
     def search(
         self,
@@ -218,30 +749,171 @@ class PGVector(VectorStoreBase):
         Returns:
             list: Search results.
         """
+        if self.query_cache is not None:
+            cached = self.query_cache.get(vectors, limit, filters)
+            if cached is not None:
+                return cached
+            # A write committed while the query runs clears the cache; these rows must not outlive it
+            generation = self.query_cache.generation
+
+        results = self._search_rows(vectors, limit, filters)
+        output = [OutputData(id=str(r[0]), score=r[1], payload=r[2]) for r in results]
+        if self.query_cache is not None:
+            self.query_cache.put(vectors, limit, filters, output, generation=generation)
+        return output
+
+    def search_raw(
+        self,
+        query: str,
+        vectors: list[float],
+        limit: Optional[int] = 5,
+        filters: Optional[dict] = None,
+    ) -> tuple[List[str], np.ndarray, List[dict]]:
+        """
+        Search for similar vectors, returning the results column-wise instead of as OutputData objects.
+        Skips per-row model construction for callers that process many results; bypasses the query cache.
+
+        Args:
+            query (str): Query.
+            vectors (List[float]): Query vector.
+            limit (int, optional): Number of results to return. Defaults to 5.
+            filters (Dict, optional): Filters to apply to the search. Defaults to None.
+
+        Returns:
+            tuple: (ids, scores as a float64 numpy array, payloads), ordered by distance.
+        """
+        results = self._search_rows(vectors, limit, filters)
+        ids = [str(r[0]) for r in results]
+        scores = np.fromiter((r[1] for r in results), dtype=np.float64, count=len(results))
+        payloads = [r[2] for r in results]
+        return ids, scores, payloads
+
+    def search_batch(
+        self,
+        queries: List[List[float]],
+        limit: Optional[int] = 5,
+        filters: Optional[dict] = None,
+    ) -> List[List[OutputData]]:
+        """
+        Search for the nearest neighbours of several query vectors in a single round-trip.
+        Bypasses the query cache.
+
+        Args:
+            queries (List[List[float]]): Query vectors.
+            limit (int, optional): Number of results to return per query. Defaults to 5.
+            filters (Dict, optional): Filters to apply to every query. Defaults to None.
+
+        Returns:
+            List[List[OutputData]]: The search results of each query, in the order of `queries`.
+        """
+        output = [[] for _ in queries]
+        if not queries:
+            return output
+
+        filter_clause, filter_params = self._search_filter(filters)
+        if register_vector is not None:
+            query_vectors = [self._vector_param(q) for q in queries]
+        else:
+            # Without the adapters, a list of lists would be sent as a 2-D float array
+            query_vectors = [self._format_vector(q) for q in queries]
+
+        with self._get_cursor() as cur, self._transaction(cur):
+            with self._pipeline(cur):
+                self._apply_search_settings(cur, filtered=bool(filter_params))
+                self._execute(
+                    cur,
+                    sql.SQL(
+                        """
+                        SELECT q.idx, t.id, t.distance, t.payload
+                        FROM unnest(%s::{vector_type}[], %s::int[]) AS q(v, idx)
+                        CROSS JOIN LATERAL (
+                            SELECT id, vector <=> q.v AS distance, payload
+                            FROM {table}
+                            {filter_clause}
+                            ORDER BY distance
+                            LIMIT %s
+                        ) t
+                        ORDER BY q.idx, t.distance
+                        """
+                    ).format(vector_type=sql.SQL(self.storage_type), table=self._table, filter_clause=filter_clause),
+                    (query_vectors, list(range(len(queries))), *filter_params, limit),
+                    binary=True,
+                )
+            results = cur.fetchall()
+
+        for idx, vector_id, distance, payload in results:
+            output[idx].append(OutputData(id=str(vector_id), score=distance, payload=payload))
+        return output
+
+    def _search_filter(
+        self,
+        filters: Optional[dict],
+        extra_conditions: Optional[List[str]] = None,
+        extra_params: Optional[List[Any]] = None,
+    ) -> tuple[Any, List[Any]]:
+        """Build the WHERE clause and its parameters for the payload filters, plus any extra conditions."""
         filter_conditions = []
         filter_params = []
 
         if filters:
+            # One containment test per key: each maps onto the jsonb_path_ops GIN index
+            # and matches the predicate of partial indexes built by create_partial_index()
             for k, v in filters.items():
-                filter_conditions.append("payload->>%s = %s")
-                filter_params.extend([k, str(v)])
+                filter_conditions.append("payload @> %s::jsonb")
+                filter_params.append(self._json({k: v}))
 
-        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        filter_conditions.extend(extra_conditions or [])
+        filter_params.extend(extra_params or [])
 
-        with self._get_cursor() as cur:
-            cur.execute(
-                f"""
-                SELECT id, vector <=> %s::vector AS distance, payload
-                FROM {self.collection_name}
-                {filter_clause}
-                ORDER BY distance
-                LIMIT %s
-                """,
-                (vectors, *filter_params, limit),
-            )
+        filter_clause = sql.SQL("WHERE " + " AND ".join(filter_conditions) if filter_conditions else "")
+        return filter_clause, filter_params
 
-            results = cur.fetchall()
-        return [OutputData(id=str(r[0]), score=float(r[1]), payload=r[2]) for r in results]
+    def _apply_search_settings(self, cur, filtered: bool) -> None:
+        """Apply the index search parameters to the current transaction."""
+        # Keep scanning the index until enough rows pass the payload filters, instead of filtering
+        # the first candidates and returning fewer than `limit` rows
+        iterative_scan = filtered and self.pgvector_version and self.pgvector_version >= (0, 8)
+        if self.index_type == "hnsw":
+            if self.hnsw_ef_search:
+                # Scoped to this transaction, so pooled connections keep the server default
+                self._execute(cur, "SELECT set_config('hnsw.ef_search', %s, true)", (str(int(self.hnsw_ef_search)),))
+            if iterative_scan:
+                self._execute(cur, "SELECT set_config('hnsw.iterative_scan', 'strict_order', true)")
+        elif self.index_type == "ivfflat":
+            if self.ivfflat_probes:
+                self._execute(cur, "SELECT set_config('ivfflat.probes', %s, true)", (str(int(self.ivfflat_probes)),))
+            if iterative_scan:
+                # IVFFlat only supports relaxed ordering of the scanned lists
+                self._execute(cur, "SELECT set_config('ivfflat.iterative_scan', 'relaxed_order', true)")
+
+    def _search_rows(self, vectors: list[float], limit: Optional[int], filters: Optional[dict]) -> List[tuple]:
+        """Run the nearest neighbour query and return the raw (id, distance, payload) rows."""
+        filter_clause, filter_params = self._search_filter(filters)
+
+        with self._get_cursor() as cur, self._transaction(cur):
+            with self._pipeline(cur):
+                self._apply_search_settings(cur, filtered=bool(filter_params))
+                self._execute(
+                    cur,
+                    sql.SQL(
+                        """
+                        SELECT id, vector <=> %s::{vector_type} AS distance, payload
+                        FROM {table}
+                        {filter_clause}
+                        ORDER BY distance
+                        LIMIT %s
+                        """
+                    ).format(vector_type=sql.SQL(self.storage_type), table=self._table, filter_clause=filter_clause),
+                    (self._vector_param(vectors), *filter_params, limit),
+                    binary=True,
+                )
+
+            return cur.fetchall()
+
+    def _invalidate_query_cache(self) -> None:
+        """Drop cached search results after the collection has been modified."""
+        if self.query_cache is not None:
+            self.query_cache.clear()
 
     def delete(self, vector_id: str) -> None:
         """
@@ -251,7 +923,8 @@ class PGVector(VectorStoreBase):
             vector_id (str): ID of the vector to delete.
         """
         with self._get_cursor(commit=True) as cur:
-            cur.execute(f"DELETE FROM {self.collection_name} WHERE id = %s", (vector_id,))
+            self._execute(cur, self._sql_delete, (vector_id,))
+        self._invalidate_query_cache()
 
     def update(
         self,
@@ -267,47 +940,57 @@ class PGVector(VectorStoreBase):
             vector (List[float], optional): Updated vector.
             payload (Dict, optional): Updated payload.
         """
-        with self._get_cursor(commit=True) as cur:
-            if vector:
-               cur.execute(
-                    f"UPDATE {self.collection_name} SET vector = %s WHERE id = %s",
-                    (vector, vector_id),
-                )
-            if payload:
-                # Handle JSON serialization based on psycopg version
-                if PSYCOPG_VERSION == 3:
-                    # psycopg3 uses psycopg.types.json.Json
-                    cur.execute(
-                        f"UPDATE {self.collection_name} SET payload = %s WHERE id = %s",
-                        (Json(payload), vector_id),
-                    )
-                else:
-                    # psycopg2 uses psycopg2.extras.Json
-                    cur.execute(
-                        f"UPDATE {self.collection_name} SET payload = %s WHERE id = %s",
-                        (Json(payload), vector_id),
-                    )
+        # Both columns are set in one statement so the row gets a single new tuple version.
+        if vector and payload:
+            query, params = self._sql_update_vector_payload, (self._vector_param(vector), self._json(payload), vector_id)
+        elif vector:
+            query, params = self._sql_update_vector, (self._vector_param(vector), vector_id)
+        elif payload:
+            query, params = self._sql_update_payload, (self._json(payload), vector_id)
+        else:
+            return
 
+        with self._get_cursor(commit=True) as cur:
+            self._execute(cur, query, params)
+        self._invalidate_query_cache()
 
-    def get(self, vector_id: str) -> OutputData:
+    def get(self, vector_id: str, include_vector: bool = False) -> OutputData:
         """
         Retrieve a vector by ID.
 
         Args:
             vector_id (str): ID of the vector to retrieve.
+            include_vector (bool, optional): Also fetch the embedding itself. Defaults to False.
 
         Returns:
             OutputData: Retrieved vector.
         """
         with self._get_cursor() as cur:
-            cur.execute(
-                f"SELECT id, vector, payload FROM {self.collection_name} WHERE id = %s",
-                (vector_id,),
-            )
+            self._execute(cur, self._sql_get_with_vector if include_vector else self._sql_get, (vector_id,))
             result = cur.fetchone()
             if not result:
                 return None
-            return OutputData(id=str(result[0]), score=None, payload=result[2])
+            return self._row_to_output(result, include_vector)
+
+    @classmethod
+    def _row_to_output(cls, row, include_vector: bool) -> OutputData:
+        """Build the OutputData of an (id, [vector,] payload) row."""
+        if include_vector:
+            return OutputData(id=str(row[0]), score=None, payload=row[2], vector=cls._parse_vector(row[1]))
+        return OutputData(id=str(row[0]), score=None, payload=row[1])
+
+    @staticmethod
+    def _parse_vector(value) -> Optional[List[float]]:
+        """Convert a vector column value to a list of floats, with or without the pgvector adapters."""
+        if value is None:
+            return None
+        if isinstance(value, str):
+            # Text representation, e.g. '[0.1,0.2,0.3]'
+            return [float(v) for v in value.strip("[]").split(",") if v]
+        if hasattr(value, "to_list"):
+            # pgvector Vector / HalfVector
+            return value.to_list()
+        return [float(v) for v in value]
 
     def list_cols(self) -> List[str]:
         """
@@ -323,26 +1006,40 @@ class PGVector(VectorStoreBase):
     def delete_col(self) -> None:
         """Delete a collection."""
         with self._get_cursor(commit=True) as cur:
-            cur.execute(f"DROP TABLE IF EXISTS {self.collection_name}")
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {table}").format(table=self._table))
+        self._invalidate_query_cache()
 
-    def col_info(self) -> dict[str, Any]:
+    def col_info(self, exact: bool = False) -> dict[str, Any]:
         """
         Get information about a collection.
 
+        Args:
+            exact (bool, optional): Count the rows with a full table scan instead of using the
+                planner's estimate from pg_class. Defaults to False.
+
         Returns:
             Dict[str, Any]: Collection information.
         """
+        if exact:
+            row_count = sql.SQL("(SELECT COUNT(*) FROM {table})").format(table=self._table)
+        else:
+            # reltuples is -1 until the table has been vacuumed or analyzed
+            row_count = sql.SQL(
+                "(SELECT GREATEST(reltuples, 0)::bigint FROM pg_class WHERE oid = quote_ident(%s)::regclass)"
+            )
         with self._get_cursor() as cur:
             cur.execute(
-                f"""
-                SELECT
-                    table_name,
-                    (SELECT COUNT(*) FROM {self.collection_name}) as row_count,
-                    (SELECT pg_size_pretty(pg_total_relation_size('{self.collection_name}'))) as total_size
-                FROM information_schema.tables
-                WHERE table_schema = 'public' AND table_name = %s
-            """,
-                (self.collection_name,),
+                sql.SQL(
+                    """
+                    SELECT
+                        table_name,
+                        {row_count} as row_count,
+                        (SELECT pg_size_pretty(pg_total_relation_size(quote_ident(%s)::regclass))) as total_size
+                    FROM information_schema.tables
+                    WHERE table_schema = 'public' AND table_name = %s
+                    """
+                ).format(row_count=row_count),
+                (self._table_name,) * (2 if exact else 3),
             )
             result = cur.fetchone()
         return {"name": result[0], "count": result[1], "size": result[2]}
@@ -350,55 +1047,114 @@ class PGVector(VectorStoreBase):
     def list(
         self,
         filters: Optional[dict] = None,
-        limit: Optional[int] = 100
-    ) -> List[OutputData]:
+        limit: Optional[int] = 100,
+        after_id: Optional[str] = None,
+        include_vector: bool = False,
+    ) -> List[List[OutputData]]:
         """
         List all vectors in a collection.
 
+        Results are ordered by id, so large collections can be paged through with keyset
+        pagination: pass the id of the last item of a page as `after_id` to get the next one.
+        Unlike OFFSET, this costs the same for every page.
+
         Args:
             filters (Dict, optional): Filters to apply to the list.
             limit (int, optional): Number of vectors to return. Defaults to 100.
+            after_id (str, optional): Only return vectors whose id sorts after this one.
+            include_vector (bool, optional): Also fetch the embeddings themselves. Defaults to False.
 
         Returns:
-            List[OutputData]: List of vectors.
+            List[List[OutputData]]: The page of vectors, wrapped in an outer list like the other
+            vector stores (Memory unwraps it with `list(...)[0]`).
         """
-        filter_conditions = []
-        filter_params = []
+        return [
+            list(self.iter_list(filters=filters, limit=limit, after_id=after_id, include_vector=include_vector))
+        ]
 
-        if filters:
-            for k, v in filters.items():
-                filter_conditions.append("payload->>%s = %s")
-                filter_params.extend([k, str(v)])
+    def iter_list(
+        self,
+        filters: Optional[dict] = None,
+        limit: Optional[int] = 100,
+        after_id: Optional[str] = None,
+        include_vector: bool = False,
+        batch_size: int = 256,
+    ) -> Iterator[OutputData]:
+        """
+        Stream the vectors of a collection, ordered by id.
+
+        Results larger than `batch_size` (or unlimited) are read through a server-side cursor
+        `batch_size` rows at a time, so memory use stays bounded and the caller can stop early
+        without the remaining rows ever being sent. Smaller ones are fetched in one round-trip.
 
-        filter_clause = "WHERE " + " AND ".join(filter_conditions) if filter_conditions else ""
+        Args:
+            filters (Dict, optional): Filters to apply to the list.
+            limit (int, optional): Maximum number of vectors to return. None returns all of them.
+            after_id (str, optional): Only return vectors whose id sorts after this one.
+            include_vector (bool, optional): Also fetch the embeddings themselves. Defaults to False.
+            batch_size (int): Number of rows fetched per round-trip. Defaults to 256.
+
+        Yields:
+            OutputData: The matching vectors.
+        """
+        if after_id is not None:
+            filter_clause, filter_params = self._search_filter(filters, ["id > %s"], [after_id])
+        else:
+            filter_clause, filter_params = self._search_filter(filters)
 
-        query = f"""
-            SELECT id, vector, payload
-            FROM {self.collection_name}
+        # The vector is by far the largest column, so only send it when asked for
+        columns = sql.SQL("id, vector, payload" if include_vector else "id, payload")
+        query = sql.SQL(
+            """
+            SELECT {columns}
+            FROM {table}
             {filter_clause}
+            ORDER BY id
             LIMIT %s
-        """
+            """
+        ).format(columns=columns, table=self._table, filter_clause=filter_clause)
 
-        with self._get_cursor() as cur:
+        if limit is not None and limit <= batch_size:
+            # A server-side cursor would only add DECLARE/FETCH/CLOSE round-trips
+            with self._get_cursor() as cur:
+                cur.execute(query, (*filter_params, limit))
+                rows = cur.fetchall()
+            for r in rows:
+                yield self._row_to_output(r, include_vector)
+            return
+
+        # Server-side cursors only live inside a transaction, which autocommit connections lack
+        with self._get_cursor(name="mem0_list") as cur, self._transaction(cur):
+            cur.itersize = batch_size
             cur.execute(query, (*filter_params, limit))
-            results = cur.fetchall()
-        return [[OutputData(id=str(r[0]), score=None, payload=r[2]) for r in results]]
+            for r in cur:
+                yield self._row_to_output(r, include_vector)
 
-    def __del__(self) -> None:
+    def close(self) -> None:
         """
-        Close the database connection pool when the object is deleted.
+        Close the database connection pool. Calling it again is a no-op.
         """
-        try:
-            # Close pool appropriately
-            if PSYCOPG_VERSION == 3:
-                self.connection_pool.close()
-            else:
-                self.connection_pool.closeall()
-        except Exception:
-            pass
+        if self._closed:
+            return
+        self._closed = True
+        _open_stores.discard(self)
+        # Close pool appropriately
+        if PSYCOPG_VERSION == 3:
+            self.connection_pool.close()
+        else:
+            self.connection_pool.closeall()
+
+    def __enter__(self) -> "PGVector":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
 
     def reset(self) -> None:
         """Reset the index by deleting and recreating it."""
         logger.warning(f"Resetting index {self.collection_name}...")
-        self.delete_col()
-        self.create_col()
+        # Drop and recreate in one transaction so the collection never appears missing
+        with self._get_cursor(commit=True) as cur:
+            cur.execute(sql.SQL("DROP TABLE IF EXISTS {table}").format(table=self._table))
+            self._create_col(cur)
+        self._invalidate_query_cache()
@@ -1,10 +1,22 @@
 import importlib
+import json
 import sys
 import unittest
 import uuid
-from unittest.mock import MagicMock, patch
+import weakref
+from unittest.mock import DEFAULT, MagicMock, patch
 
-from mem0.vector_stores.pgvector import PGVector
+import numpy as np
+from psycopg import sql
+
+from mem0.vector_stores import pgvector as pgvector_module
+from mem0.vector_stores.pgvector import OutputData, PGVector, SemanticQueryCache
+
+
+def render(call):
+    """Render a recorded call, expanding composed SQL into its query text."""
+    args = [arg.as_string(None) if isinstance(arg, sql.Composable) else arg for arg in call[0]]
+    return str((args, call[1]))
 
 
 class TestPGVector(unittest.TestCase):
@@ -13,6 +25,10 @@ class TestPGVector(unittest.TestCase):
         self.mock_conn = MagicMock()
         self.mock_cursor = MagicMock()
         self.mock_conn.cursor.return_value = self.mock_cursor
+        # Iterating the cursor yields the same rows as fetchall(), like a real cursor
+        self.mock_cursor.__iter__.side_effect = lambda: iter(self.mock_cursor.fetchall.return_value)
+        # No extensions installed yet, whatever rows a test sets up for its own queries
+        self.mock_cursor.fetchall.side_effect = self._fetchall
         
         # Mock connection pool
         self.mock_pool_psycopg2 = MagicMock()
@@ -32,6 +48,12 @@ class TestPGVector(unittest.TestCase):
         self.test_payloads = [{"key": "value1"}, {"key": "value2"}]
         self.test_ids = [str(uuid.uuid4()), str(uuid.uuid4())]
 
+    def _fetchall(self):
+        last_call = self.mock_cursor.execute.call_args
+        if last_call is not None and "FROM pg_extension" in render(last_call):
+            return []
+        return DEFAULT
+
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
     def test_init_with_individual_params_psycopg3(self, mock_psycopg_pool):
@@ -128,7 +150,7 @@ class TestPGVector(unittest.TestCase):
         # Verify vector extension and table creation
         self.mock_cursor.execute.assert_any_call("CREATE EXTENSION IF NOT EXISTS vector")
         table_creation_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "CREATE TABLE IF NOT EXISTS test_collection" in str(call)]
+                              if 'CREATE TABLE IF NOT EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(table_creation_calls) > 0)
         
         # Verify pgvector instance properties
@@ -180,7 +202,7 @@ class TestPGVector(unittest.TestCase):
         # Verify vector extension and table creation
         self.mock_cursor.execute.assert_any_call("CREATE EXTENSION IF NOT EXISTS vector")
         table_creation_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "CREATE TABLE IF NOT EXISTS test_collection" in str(call)]
+                              if 'CREATE TABLE IF NOT EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(table_creation_calls) > 0)
 
         # Verify pgvector instance properties
@@ -233,7 +255,7 @@ class TestPGVector(unittest.TestCase):
         # Verify vector extension and table creation
         self.mock_cursor.execute.assert_any_call("CREATE EXTENSION IF NOT EXISTS vector")
         table_creation_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "CREATE TABLE IF NOT EXISTS test_collection" in str(call)]
+                              if 'CREATE TABLE IF NOT EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(table_creation_calls) > 0)
 
         # Verify pgvector instance properties
@@ -277,7 +299,7 @@ class TestPGVector(unittest.TestCase):
         # Verify vector extension and table creation
         self.mock_cursor.execute.assert_any_call("CREATE EXTENSION IF NOT EXISTS vector")
         table_creation_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "CREATE TABLE IF NOT EXISTS test_collection" in str(call)]
+                              if 'CREATE TABLE IF NOT EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(table_creation_calls) > 0)
         
         # Verify pgvector instance properties
@@ -317,17 +339,20 @@ class TestPGVector(unittest.TestCase):
         # Verify the _get_cursor context manager was called
         mock_get_cursor.assert_called()
         
-        # Verify insert query was executed (psycopg3 uses executemany)
-        insert_calls = [call for call in self.mock_cursor.executemany.call_args_list 
-                       if "INSERT INTO test_collection" in str(call)]
-        self.assertTrue(len(insert_calls) > 0)
-        
+        # Verify the batch was streamed with a single COPY (psycopg3)
+        self.mock_cursor.executemany.assert_not_called()
+        self.mock_cursor.copy.assert_called_once()
+        self.assertIn(
+            'COPY "test_collection" (id, vector, payload) FROM STDIN', self.mock_cursor.copy.call_args[0][0].as_string(None)
+        )
+
         # Verify data format
-        call_args = self.mock_cursor.executemany.call_args
-        data_arg = call_args[0][1]
-        self.assertEqual(len(data_arg), 2)
-        self.assertEqual(data_arg[0][0], self.test_ids[0])
-        self.assertEqual(data_arg[1][0], self.test_ids[1])
+        mock_copy = self.mock_cursor.copy.return_value.__enter__.return_value
+        rows = [call[0][0] for call in mock_copy.write_row.call_args_list]
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0][0], self.test_ids[0])
+        self.assertEqual(rows[1][0], self.test_ids[1])
+        self.assertEqual(rows[0][1], "[0.1,0.2,0.3]")
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
@@ -353,6 +378,7 @@ class TestPGVector(unittest.TestCase):
         mock_psycopg2 = MagicMock()
         mock_psycopg2.extras = mock_psycopg2_extras
         mock_psycopg2.pool = mock_psycopg2_pool
+        mock_psycopg2.sql = sql
 
         # Patch sys.modules so that imports in PGVector use our mocks
         with patch.dict('sys.modules', {
@@ -392,13 +418,18 @@ class TestPGVector(unittest.TestCase):
             mock_execute_values.assert_called_once()
             call_args = mock_execute_values.call_args
 
-            self.assertIn("INSERT INTO test_collection", call_args[0][1])
+            self.assertIn('INSERT INTO "test_collection"', call_args[0][1].as_string(None))
 
             # The data argument should be a list of tuples, one per vector
             data_arg = call_args[0][2]
             self.assertEqual(len(data_arg), 2)
             self.assertEqual(data_arg[0][0], self.test_ids[0])
             self.assertEqual(data_arg[1][0], self.test_ids[1])
+            # The whole batch should be sent in a single page
+            self.assertEqual(call_args[1]["page_size"], 2)
+
+        # Restore the real driver imports for the tests that follow
+        importlib.reload(sys.modules['mem0.vector_stores.pgvector'])
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
@@ -439,7 +470,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call)]
+                       if "SELECT id, vector <=" in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -488,7 +519,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call)]
+                       if "SELECT id, vector <=" in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -534,7 +565,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify delete query was executed
         delete_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "DELETE FROM test_collection" in str(call)]
+                       if 'DELETE FROM "test_collection"' in render(call)]
         self.assertTrue(len(delete_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
@@ -573,7 +604,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify delete query was executed
         delete_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "DELETE FROM test_collection" in str(call)]
+                       if 'DELETE FROM "test_collection"' in render(call)]
         self.assertTrue(len(delete_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
@@ -615,7 +646,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify update queries were executed
         update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "UPDATE test_collection" in str(call)]
+                       if 'UPDATE "test_collection"' in render(call)]
         self.assertTrue(len(update_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
@@ -657,7 +688,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify update queries were executed
         update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "UPDATE test_collection" in str(call)]
+                       if 'UPDATE "test_collection"' in render(call)]
         self.assertTrue(len(update_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
@@ -674,7 +705,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = []  # No existing collections
-        self.mock_cursor.fetchone.return_value = (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"})
+        self.mock_cursor.fetchone.return_value = (self.test_ids[0], {"key": "value1"})
         
         pgvector = PGVector(
             dbname="test_db",
@@ -697,7 +728,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify get query was executed
         get_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                    if "SELECT id, vector, payload" in str(call)]
+                    if "SELECT id, payload" in render(call)]
         self.assertTrue(len(get_calls) > 0)
         
         # Verify result
@@ -719,7 +750,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = []  # No existing collections
-        self.mock_cursor.fetchone.return_value = (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"})
+        self.mock_cursor.fetchone.return_value = (self.test_ids[0], {"key": "value1"})
         
         pgvector = PGVector(
             dbname="test_db",
@@ -742,7 +773,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify get query was executed
         get_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                    if "SELECT id, vector, payload" in str(call)]
+                    if "SELECT id, payload" in render(call)]
         self.assertTrue(len(get_calls) > 0)
         
         # Verify result
@@ -783,7 +814,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list_cols query was executed
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT table_name FROM information_schema.tables" in str(call)]
+                     if "SELECT table_name FROM information_schema.tables" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify result
@@ -825,7 +856,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list_cols query was executed
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT table_name FROM information_schema.tables" in str(call)]
+                     if "SELECT table_name FROM information_schema.tables" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify result
@@ -867,7 +898,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify delete_col query was executed
         delete_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "DROP TABLE IF EXISTS test_collection" in str(call)]
+                       if 'DROP TABLE IF EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(delete_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
@@ -906,7 +937,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify delete_col query was executed
         delete_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "DROP TABLE IF EXISTS test_collection" in str(call)]
+                       if 'DROP TABLE IF EXISTS "test_collection"' in render(call)]
         self.assertTrue(len(delete_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
@@ -946,14 +977,27 @@ class TestPGVector(unittest.TestCase):
         
         # Verify col_info query was executed
         info_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT table_name" in str(call)]
+                     if "SELECT table_name" in render(call)]
         self.assertTrue(len(info_calls) > 0)
-        
+
+        # Verify the row count comes from the catalog estimate, not a table scan
+        info_query = render(self.mock_cursor.execute.call_args)
+        self.assertIn("reltuples", info_query)
+        self.assertNotIn("COUNT(*)", info_query)
+
         # Verify result
         self.assertEqual(info["name"], "test_collection")
         self.assertEqual(info["count"], 100)
         self.assertEqual(info["size"], "1 MB")
 
+        # Verify exact counts are opt-in
+        self.mock_cursor.execute.reset_mock()
+        pgvector.col_info(exact=True)
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertIn('SELECT COUNT(*) FROM "test_collection"', query.as_string(None))
+        self.assertNotIn("reltuples", query.as_string(None))
+        self.assertEqual(params, ("test_collection", "test_collection"))
+
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
     @patch.object(PGVector, '_get_cursor')
@@ -991,7 +1035,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify col_info query was executed
         info_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT table_name" in str(call)]
+                     if "SELECT table_name" in render(call)]
         self.assertTrue(len(info_calls) > 0)
         
         # Verify result
@@ -1013,8 +1057,8 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"}),
-            (self.test_ids[1], [0.4, 0.5, 0.6], {"key": "value2"}),
+            (self.test_ids[0], {"key": "value1"}),
+            (self.test_ids[1], {"key": "value2"}),
         ]
         
         pgvector = PGVector(
@@ -1038,7 +1082,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call)]
+                     if "SELECT id, payload" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify result
@@ -1047,6 +1091,162 @@ class TestPGVector(unittest.TestCase):
         self.assertEqual(results[0][0].id, self.test_ids[0])
         self.assertEqual(results[0][1].id, self.test_ids[1])
 
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_list_keyset_pagination_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that list orders by id and pages with after_id instead of OFFSET."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+
+        self.mock_cursor.fetchall.return_value = [(self.test_ids[1], {"user_id": "alice"})]
+        results = pgvector.list(filters={"user_id": "alice"}, limit=1, after_id=self.test_ids[0])
+
+        query, params = self.mock_cursor.execute.call_args[0]
+        query = query.as_string(None)
+        self.assertIn("id > %s", query)
+        self.assertIn("ORDER BY id", query)
+        self.assertNotIn("OFFSET", query)
+        self.assertEqual(params[1:], (self.test_ids[0], 1))
+        self.assertEqual(results[0][0].id, self.test_ids[1])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_iter_list_streams_from_server_side_cursor_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that iter_list reads rows in batches from a named cursor and can stop early."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+
+        self.mock_cursor.fetchall.return_value = [
+            (self.test_ids[0], {"key": "value1"}),
+            (self.test_ids[1], {"key": "value2"}),
+        ]
+        self.mock_cursor.fetchall.reset_mock()
+        rows = pgvector.iter_list(limit=None, batch_size=50)
+        first = next(rows)
+
+        mock_get_cursor.assert_called_with(name="mem0_list")
+        self.mock_cursor.connection.transaction.assert_called()
+        self.assertEqual(self.mock_cursor.itersize, 50)
+        self.assertEqual(first.id, self.test_ids[0])
+
+        # Closing the generator early releases the cursor
+        rows.close()
+        mock_get_cursor.return_value.__exit__.assert_called()
+        self.mock_cursor.fetchall.assert_not_called()
+
+        # Limits that fit in one batch skip the server-side cursor
+        mock_get_cursor.reset_mock()
+        results = list(pgvector.iter_list(limit=2, batch_size=50))
+        mock_get_cursor.assert_called_once_with()
+        self.mock_cursor.fetchall.assert_called_once()
+        self.assertEqual([r.id for r in results], self.test_ids[:2])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_include_vector_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that the vector column is only selected and returned when requested."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+
+        # Vectors come back as numpy arrays with the pgvector adapters registered
+        self.mock_cursor.fetchone.return_value = (self.test_ids[0], np.array([0.5, 0.25, 0.125]), {"key": "value1"})
+        result = pgvector.get(self.test_ids[0], include_vector=True)
+        query = self.mock_cursor.execute.call_args[0][0].as_string(None)
+        self.assertIn("SELECT id, vector, payload", query)
+        self.assertEqual(result.vector, [0.5, 0.25, 0.125])
+        self.assertEqual(result.payload, {"key": "value1"})
+
+        # ...and in their text form without them
+        self.mock_cursor.fetchall.return_value = [(self.test_ids[0], "[0.5,0.25,0.125]", {"key": "value1"})]
+        results = pgvector.list(limit=1, include_vector=True)
+        query = self.mock_cursor.execute.call_args[0][0].as_string(None)
+        self.assertIn("SELECT id, vector, payload", query)
+        self.assertEqual(results[0][0].vector, [0.5, 0.25, 0.125])
+
+        # Without include_vector the column is not fetched at all
+        self.mock_cursor.fetchone.return_value = (self.test_ids[0], {"key": "value1"})
+        result = pgvector.get(self.test_ids[0])
+        query = self.mock_cursor.execute.call_args[0][0].as_string(None)
+        self.assertNotIn("vector", query)
+        self.assertIsNone(result.vector)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    def test_get_cursor_named_psycopg2(self, mock_connection_pool):
+        """Test that passing a name to _get_cursor opens a server-side cursor."""
+        mock_connection_pool.return_value = self.mock_pool_psycopg2
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+
+        with pgvector._get_cursor(name="mem0_list"):
+            pass
+        self.mock_conn.cursor.assert_called_with(name="mem0_list")
+        self.mock_pool_psycopg2.putconn.assert_called_with(self.mock_conn)
+
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
     @patch.object(PGVector, '_get_cursor')
@@ -1061,8 +1261,8 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"}),
-            (self.test_ids[1], [0.4, 0.5, 0.6], {"key": "value2"}),
+            (self.test_ids[0], {"key": "value1"}),
+            (self.test_ids[1], {"key": "value2"}),
         ]
         
         pgvector = PGVector(
@@ -1086,7 +1286,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call)]
+                     if "SELECT id, payload" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify result
@@ -1134,8 +1334,26 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed with filters
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(search_calls) > 0)
+
+        # Verify bitmap scans stay enabled, so the payload GIN index remains usable
+        self.assertFalse(any("enable_bitmapscan" in render(call) for call in self.mock_cursor.execute.call_args_list))
+
+        # Verify the search runs in an explicit transaction
+        self.mock_cursor.connection.transaction.assert_called()
+
+        # Verify each filter is a JSONB containment test bound as a single-key object
+        query, params = search_calls[0][0]
+        query = query.as_string(None)
+        self.assertEqual(query.count("payload @> %s::jsonb"), 3)
+        self.assertNotIn("payload->>", query)
+        self.assertEqual(len(params), 5)  # vector, 3 filters, limit
+        with patch('mem0.vector_stores.pgvector.Json', side_effect=lambda obj, dumps=None: obj):
+            self.mock_cursor.execute.reset_mock()
+            pgvector.search("test query", [0.1, 0.2, 0.3], limit=2, filters=filters)
+            params = self.mock_cursor.execute.call_args[0][1]
+        self.assertEqual(list(params[1:4]), [{"user_id": "alice"}, {"agent_id": "agent1"}, {"run_id": "run1"}])
         
         # Verify results
         self.assertEqual(len(results), 1)
@@ -1184,7 +1402,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed with filters
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -1234,7 +1452,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed with single filter
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -1282,7 +1500,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed with single filter
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -1330,8 +1548,13 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed without WHERE clause
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" not in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" not in render(call)]
         self.assertTrue(len(search_calls) > 0)
+
+        # Verify bitmap scans are left alone when there is nothing to filter on
+        bitmapscan_calls = [call for call in self.mock_cursor.execute.call_args_list
+                            if "enable_bitmapscan" in render(call)]
+        self.assertEqual(len(bitmapscan_calls), 0)
         
         # Verify results
         self.assertEqual(len(results), 2)
@@ -1379,7 +1602,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify search query was executed without WHERE clause
         search_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "SELECT id, vector <=" in str(call) and "WHERE" not in str(call)]
+                       if "SELECT id, vector <=" in render(call) and "WHERE" not in render(call)]
         self.assertTrue(len(search_calls) > 0)
         
         # Verify results
@@ -1403,7 +1626,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"user_id": "alice", "agent_id": "agent1"}),
+            (self.test_ids[0], {"user_id": "alice", "agent_id": "agent1"}),
         ]
         
         pgvector = PGVector(
@@ -1428,7 +1651,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed with filters
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1452,7 +1675,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"user_id": "alice", "agent_id": "agent1"}),
+            (self.test_ids[0], {"user_id": "alice", "agent_id": "agent1"}),
         ]
         
         pgvector = PGVector(
@@ -1477,7 +1700,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed with filters
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1501,7 +1724,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"user_id": "alice"}),
+            (self.test_ids[0], {"user_id": "alice"}),
         ]
         
         pgvector = PGVector(
@@ -1526,7 +1749,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed with single filter
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1549,7 +1772,7 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"user_id": "alice"}),
+            (self.test_ids[0], {"user_id": "alice"}),
         ]
         
         pgvector = PGVector(
@@ -1574,7 +1797,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed with single filter
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1597,8 +1820,8 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"}),
-            (self.test_ids[1], [0.4, 0.5, 0.6], {"key": "value2"}),
+            (self.test_ids[0], {"key": "value1"}),
+            (self.test_ids[1], {"key": "value2"}),
         ]
         
         pgvector = PGVector(
@@ -1622,7 +1845,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed without WHERE clause
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" not in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" not in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1645,8 +1868,8 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__exit__.return_value = None
         
         self.mock_cursor.fetchall.return_value = [
-            (self.test_ids[0], [0.1, 0.2, 0.3], {"key": "value1"}),
-            (self.test_ids[1], [0.4, 0.5, 0.6], {"key": "value2"}),
+            (self.test_ids[0], {"key": "value1"}),
+            (self.test_ids[1], {"key": "value2"}),
         ]
         
         pgvector = PGVector(
@@ -1670,7 +1893,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify list query was executed without WHERE clause
         list_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "SELECT id, vector, payload" in str(call) and "WHERE" not in str(call)]
+                     if "SELECT id, payload" in render(call) and "WHERE" not in render(call)]
         self.assertTrue(len(list_calls) > 0)
         
         # Verify results
@@ -1708,16 +1931,17 @@ class TestPGVector(unittest.TestCase):
             maxconn=4
         )
         
+        mock_get_cursor.reset_mock()
         pgvector.reset()
         
-        # Verify the _get_cursor context manager was called
-        mock_get_cursor.assert_called()
+        # Verify DROP and CREATE ran in a single transaction
+        mock_get_cursor.assert_called_once_with(commit=True)
         
         # Verify reset operations were executed
         drop_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "DROP TABLE IF EXISTS" in str(call)]
+                     if "DROP TABLE IF EXISTS" in render(call)]
         create_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "CREATE TABLE IF NOT EXISTS" in str(call)]
+                       if "CREATE TABLE IF NOT EXISTS" in render(call)]
         self.assertTrue(len(drop_calls) > 0)
         self.assertTrue(len(create_calls) > 0)
 
@@ -1757,9 +1981,9 @@ class TestPGVector(unittest.TestCase):
         
         # Verify reset operations were executed
         drop_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "DROP TABLE IF EXISTS" in str(call)]
+                     if "DROP TABLE IF EXISTS" in render(call)]
         create_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "CREATE TABLE IF NOT EXISTS" in str(call)]
+                       if "CREATE TABLE IF NOT EXISTS" in render(call)]
         self.assertTrue(len(drop_calls) > 0)
         self.assertTrue(len(create_calls) > 0)
 
@@ -1798,11 +2022,11 @@ class TestPGVector(unittest.TestCase):
         pgvector.update("test-id-123", payload=test_payload)
         
         # Verify Json() wrapper was used for psycopg3
-        mock_json.assert_called_once_with(test_payload)
+        mock_json.assert_called_once_with(test_payload, dumps=PGVector._dumps_json)
         
         # Verify the update query was executed
         update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "UPDATE test_collection SET payload" in str(call)]
+                       if 'UPDATE "test_collection" SET payload' in render(call)]
         self.assertTrue(len(update_calls) > 0)
 
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
@@ -1839,13 +2063,27 @@ class TestPGVector(unittest.TestCase):
         pgvector.update("test-id-123", payload=test_payload)
         
         # Verify psycopg2.extras.Json() wrapper was used
-        mock_json.assert_called_once_with(test_payload)
+        mock_json.assert_called_once_with(test_payload, dumps=PGVector._dumps_json)
         
         # Verify the update query was executed
         update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                       if "UPDATE test_collection SET payload" in str(call)]
+                       if 'UPDATE "test_collection" SET payload' in render(call)]
         self.assertTrue(len(update_calls) > 0)
 
+    def test_dumps_json(self):
+        """Test payload serialization with orjson and with the stdlib fallback."""
+        payload = {"data": "café", "count": 1, 2: "non-string key"}
+        expected = {"data": "café", "count": 1, "2": "non-string key"}
+
+        self.assertEqual(json.loads(PGVector._dumps_json(payload)), expected)
+        with patch('mem0.vector_stores.pgvector.orjson', None):
+            self.assertEqual(json.loads(PGVector._dumps_json(payload)), expected)
+
+        # numpy scalars and integers wider than 64 bits are still accepted
+        self.assertEqual(json.loads(PGVector._dumps_json({"score": np.float64(0.5)})), {"score": 0.5})
+        self.assertEqual(json.loads(PGVector._dumps_json({"rank": np.float32(0.25)})), {"rank": 0.25})
+        self.assertEqual(json.loads(PGVector._dumps_json({"big": 2**70})), {"big": 2**70})
+
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
     def test_transaction_rollback_on_error_psycopg2(self, mock_connection_pool):
@@ -1928,6 +2166,75 @@ class TestPGVector(unittest.TestCase):
         # Verify connection was returned to pool
         mock_pool.putconn.assert_called_with(mock_conn)
 
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
+    @patch('mem0.vector_stores.pgvector.register_vector')
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    def test_register_vector_types_once_per_connection(self, mock_connection_pool, mock_register_vector):
+        """Test that pgvector type adapters are registered only once per pooled connection."""
+        mock_pool = MagicMock()
+        mock_connection_pool.return_value = mock_pool
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.return_value = []
+        mock_conn.cursor.return_value = mock_cursor
+        mock_pool.getconn.return_value = mock_conn
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+        pgvector.search("test query", [0.1, 0.2, 0.3])
+        pgvector.delete("test-id")
+
+        mock_register_vector.assert_called_once_with(mock_conn)
+
+        # Query vectors are bound as float32 numpy arrays
+        search_call = [call for call in mock_cursor.execute.call_args_list if "SELECT id, vector <=" in render(call)][0]
+        query_vector = search_call[0][1][0]
+        self.assertIsInstance(query_vector, np.ndarray)
+        self.assertEqual(query_vector.dtype, np.float32)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
+    @patch('mem0.vector_stores.pgvector.register_vector')
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    def test_register_vector_types_retried_when_type_missing(self, mock_connection_pool, mock_register_vector):
+        """Test that a failed registration (vector extension not created yet) is retried on the next use."""
+        mock_pool = MagicMock()
+        mock_connection_pool.return_value = mock_pool
+        mock_conn = MagicMock()
+        mock_cursor = MagicMock()
+        mock_cursor.fetchall.side_effect = [[("vector", "0.8.0")], [("test_collection",)]]
+        mock_conn.cursor.return_value = mock_cursor
+        mock_pool.getconn.return_value = mock_conn
+        mock_register_vector.side_effect = [Exception("vector type not found in the database"), None, None]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4
+        )
+        pgvector.delete("test-id")
+        pgvector.delete("test-id")
+
+        self.assertEqual(mock_register_vector.call_count, 2)
+
     # Enhanced Tests for Error Handling
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
     @patch('mem0.vector_stores.pgvector.ConnectionPool')
@@ -2003,9 +2310,9 @@ class TestPGVector(unittest.TestCase):
         
         # Verify only vector update query was executed (not payload)
         vector_update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "UPDATE test_collection SET vector" in str(call) and "payload" not in str(call)]
+                              if 'UPDATE "test_collection" SET vector' in render(call) and "payload" not in render(call)]
         payload_update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                               if "UPDATE test_collection SET payload" in str(call)]
+                               if 'UPDATE "test_collection" SET payload' in render(call)]
         
         self.assertTrue(len(vector_update_calls) > 0)
         self.assertEqual(len(payload_update_calls), 0)
@@ -2043,14 +2350,15 @@ class TestPGVector(unittest.TestCase):
         test_payload = {"updated": True}
         pgvector.update("test-id", vector=test_vector, payload=test_payload)
         
-        # Verify both vector and payload update queries were executed
-        vector_update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                              if "UPDATE test_collection SET vector" in str(call)]
-        payload_update_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                               if "UPDATE test_collection SET payload" in str(call)]
+        # Verify vector and payload are updated by a single statement
+        update_calls = [call for call in self.mock_cursor.execute.call_args_list 
+                        if 'UPDATE "test_collection"' in render(call)]
         
-        self.assertTrue(len(vector_update_calls) > 0)
-        self.assertTrue(len(payload_update_calls) > 0)
+        self.assertEqual(len(update_calls), 1)
+        self.assertEqual(
+            update_calls[0][0][0].as_string(None), 'UPDATE "test_collection" SET vector = %s, payload = %s WHERE id = %s'
+        )
+        self.assertEqual(update_calls[0][0][1][2], "test-id")
 
     # Enhanced Tests for Connection String Handling
     @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
@@ -2104,9 +2412,8 @@ class TestPGVector(unittest.TestCase):
         mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
         mock_get_cursor.return_value.__exit__.return_value = None
         
-        # Mock vectorscale extension as available
-        self.mock_cursor.fetchall.return_value = []  # No existing collections
-        self.mock_cursor.fetchone.return_value = ("vectorscale",)  # Extension exists
+        # Mock vectorscale extension as available, then no existing collections
+        self.mock_cursor.fetchall.side_effect = [[("vector", "0.8.0"), ("vectorscale", "0.5.1")], []]
         
         pgvector = PGVector(
             dbname="test_db",
@@ -2124,7 +2431,7 @@ class TestPGVector(unittest.TestCase):
         
         # Verify DiskANN index creation query was executed
         diskann_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                        if "USING diskann" in str(call)]
+                        if "USING diskann" in render(call)]
         self.assertTrue(len(diskann_calls) > 0)
         self.assertEqual(pgvector.collection_name, "test_collection")
         self.assertEqual(pgvector.embedding_model_dims, 3)
@@ -2161,70 +2468,956 @@ class TestPGVector(unittest.TestCase):
         
         # Verify HNSW index creation query was executed
         hnsw_calls = [call for call in self.mock_cursor.execute.call_args_list 
-                     if "USING hnsw" in str(call)]
+                     if "USING hnsw" in render(call)]
         self.assertTrue(len(hnsw_calls) > 0)
+        self.assertIn("WITH (m = 16, ef_construction = 64)", render(hnsw_calls[0]))
         self.assertEqual(pgvector.collection_name, "test_collection")
         self.assertEqual(pgvector.embedding_model_dims, 3)
 
-    # Enhanced Test for Pool Cleanup
-    def test_pool_cleanup_psycopg3(self):
-        """Test that psycopg3 pool is properly closed on object deletion."""
-        with patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3), \
-             patch('mem0.vector_stores.pgvector.ConnectionPool') as mock_connection_pool:
-            
-            mock_pool = MagicMock()
-            mock_connection_pool.return_value = mock_pool
-            self.mock_cursor.fetchall.return_value = []  # No existing collections
-            
-            pgvector = PGVector(
-                dbname="test_db",
-                collection_name="test_collection",
-                embedding_model_dims=3,
-                user="test_user",
-                password="test_pass",
-                host="localhost",
-                port=5432,
-                diskann=False,
-                hnsw=False,
-                minconn=1,
-                maxconn=4
-            )
-            
-            # Trigger __del__ method
-            del pgvector
-            
-            # Verify pool.close() was called
-            mock_pool.close.assert_called()
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_hnsw_tuning_params_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that HNSW build parameters and ef_search are applied."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
 
-    def test_pool_cleanup_psycopg2(self):
-        """Test that psycopg2 pool is properly closed on object deletion."""
-        with patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2), \
-             patch('mem0.vector_stores.pgvector.ConnectionPool') as mock_connection_pool:
-            
-            mock_pool = MagicMock()
-            mock_connection_pool.return_value = mock_pool
-            self.mock_cursor.fetchall.return_value = []  # No existing collections
-            
-            pgvector = PGVector(
-                dbname="test_db",
-                collection_name="test_collection",
-                embedding_model_dims=3,
-                user="test_user",
-                password="test_pass",
-                host="localhost",
-                port=5432,
-                diskann=False,
-                hnsw=False,
-                minconn=1,
-                maxconn=4
-            )
-            
-            # Trigger __del__ method
-            del pgvector
-            
-            # Verify pool.closeall() was called
-            mock_pool.closeall.assert_called()
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            hnsw_m=32,
+            hnsw_ef_construction=128,
+            hnsw_ef_search=100,
+        )
 
-    def tearDown(self):
-        """Clean up after each test."""
-        pass
+        hnsw_calls = [call for call in self.mock_cursor.execute.call_args_list
+                     if "USING hnsw" in render(call)]
+        self.assertIn("WITH (m = 32, ef_construction = 128)", render(hnsw_calls[0]))
+
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2)
+
+        execute_calls = self.mock_cursor.execute.call_args_list
+        self.assertIn("set_config('hnsw.ef_search'", execute_calls[0][0][0])
+        self.assertEqual(execute_calls[0][0][1], ("100",))
+        self.assertIn("SELECT id, vector <=", render(execute_calls[1]))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_hnsw_unset_build_params_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that unset HNSW build parameters fall back to the pgvector defaults."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+        PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            hnsw_m=None,
+            hnsw_ef_construction=None,
+        )
+
+        hnsw_calls = [call for call in self.mock_cursor.execute.call_args_list
+                     if "USING hnsw" in render(call)]
+        self.assertIn("WITH (m = 16, ef_construction = 64)", render(hnsw_calls[0]))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_ivfflat_index_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that the IVFFlat index is built on request and searches only use IVFFlat settings."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+        self.mock_cursor.fetchone.return_value = ("0.8.0",)
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            hnsw_ef_search=100,
+            ivfflat=True,
+            ivfflat_lists=400,
+        )
+
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("USING ivfflat" in q for q in queries))
+        self.assertFalse(any("USING hnsw" in q for q in queries))
+        self.assertEqual(pgvector.ivfflat_probes, 20)
+
+        self.mock_cursor.execute.reset_mock()
+        pgvector.create_ivfflat_index()
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("COUNT(*)" in q for q in queries))
+        drop_idx = next(i for i, q in enumerate(queries) if "DROP INDEX IF EXISTS" in q)
+        create_idx = next(i for i, q in enumerate(queries) if "USING ivfflat" in q)
+        mem_idx = next(i for i, q in enumerate(queries) if "maintenance_work_mem" in q)
+        self.assertLess(mem_idx, create_idx)
+        self.assertLess(drop_idx, create_idx)
+        self.assertIn("USING ivfflat (vector vector_cosine_ops)", queries[create_idx])
+        self.assertIn("WITH (lists = 400)", queries[create_idx])
+
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2)
+        probes_calls = [call for call in self.mock_cursor.execute.call_args_list
+                        if "ivfflat.probes" in render(call)]
+        self.assertEqual(len(probes_calls), 1)
+        self.assertEqual(probes_calls[0][0][1], ("20",))
+
+        # hnsw=True is overridden by ivfflat, so no HNSW settings are sent, and filtered
+        # searches use IVFFlat's iterative scan
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2, filters={"user_id": "alice"})
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("hnsw." in q for q in queries))
+        self.assertTrue(any("ivfflat.iterative_scan" in q and "relaxed_order" in q for q in queries))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_ivfflat_lists_sized_from_rows_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that unset IVFFlat lists are sized from the row count when the index is built."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            ivfflat=True,
+            ivfflat_lists=None,
+        )
+        self.assertIsNone(pgvector.ivfflat_probes)
+
+        def built_lists(rows):
+            self.mock_cursor.execute.reset_mock()
+            self.mock_cursor.fetchone.return_value = (rows,)
+            pgvector.create_ivfflat_index()
+            return next(render(call) for call in self.mock_cursor.execute.call_args_list
+                        if "USING ivfflat" in render(call))
+
+        self.assertIn("WITH (lists = 250)", built_lists(250_000))
+        self.assertEqual(pgvector.ivfflat_probes, 16)
+        self.assertIn("WITH (lists = 2000)", built_lists(4_000_000))
+        self.assertEqual(pgvector.ivfflat_probes, 45)
+        self.assertIn("WITH (lists = 1)", built_lists(10))
+
+        # An explicit lists argument skips the row count
+        self.mock_cursor.execute.reset_mock()
+        pgvector.create_ivfflat_index(lists=64)
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("COUNT(*)" in q for q in queries))
+        self.assertTrue(any("WITH (lists = 64)" in q for q in queries))
+        self.assertEqual(pgvector.ivfflat_probes, 8)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_ivfflat_probes_from_existing_index_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that default probes are derived from the lists of an existing IVFFlat index."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+        self.mock_cursor.fetchone.side_effect = [("0.8.0",), (["lists=900"],)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            ivfflat=True,
+        )
+        self.assertEqual(pgvector.ivfflat_probes, 30)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_extensions_prepared_once_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that extension setup runs once at init and create_col reuses the vectorscale check."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        # vectorscale installed but vector missing, then no existing collections
+        self.mock_cursor.fetchall.side_effect = [[("vectorscale", "0.5.1")], []]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=True,
+            hnsw=False,
+            minconn=1,
+            maxconn=4,
+        )
+
+        self.assertTrue(pgvector.has_vectorscale)
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertEqual(sum("CREATE EXTENSION" in q for q in queries), 1)
+        self.assertEqual(sum("vectorscale" in q for q in queries), 1)
+        self.assertTrue(any("USING diskann" in q for q in queries))
+
+        # Creating the collection again issues no extension DDL or lookups
+        self.mock_cursor.execute.reset_mock()
+        pgvector.has_vectorscale = False
+        pgvector.create_col()
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("CREATE EXTENSION" in q or "vectorscale" in q for q in queries))
+        self.assertFalse(any("USING diskann" in q for q in queries))
+
+        # With both extensions installed no DDL runs at all, so read replicas work
+        self.mock_cursor.execute.reset_mock()
+        self.mock_cursor.fetchall.side_effect = [
+            [("vector", "0.8.0"), ("vectorscale", "0.5.1")],
+            [("test_collection",)],
+        ]
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=True,
+            hnsw=False,
+            minconn=1,
+            maxconn=4,
+        )
+        self.assertTrue(pgvector.has_vectorscale)
+        self.assertEqual(pgvector.pgvector_version, (0, 8))
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("CREATE " in q for q in queries))
+        # Names and versions come back from a single catalog lookup
+        self.assertEqual(sum("pg_extension" in q for q in queries), 1)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_index_build_settings_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that maintenance memory and parallel workers are raised before building the HNSW index."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+        PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            maintenance_work_mem="512MB",
+            max_parallel_maintenance_workers=3,
+        )
+
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        mem_idx = next(i for i, q in enumerate(queries) if "maintenance_work_mem" in q)
+        workers_idx = next(i for i, q in enumerate(queries) if "max_parallel_maintenance_workers" in q)
+        hnsw_idx = next(i for i, q in enumerate(queries) if "USING hnsw" in q)
+        self.assertLess(mem_idx, hnsw_idx)
+        self.assertLess(workers_idx, hnsw_idx)
+        self.assertEqual(self.mock_cursor.execute.call_args_list[mem_idx][0][1], ("512MB",))
+        self.assertEqual(self.mock_cursor.execute.call_args_list[workers_idx][0][1], ("3",))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_hnsw_iterative_scan_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that filtered HNSW searches use iterative index scans on pgvector >= 0.8."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+        self.mock_cursor.fetchone.return_value = ("0.8.0",)
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+        self.assertEqual(pgvector.pgvector_version, (0, 8))
+        self.mock_cursor.fetchall.return_value = []
+
+        def iterative_scan_calls():
+            return [call for call in self.mock_cursor.execute.call_args_list
+                    if "hnsw.iterative_scan" in render(call)]
+
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2, filters={"user_id": "alice"})
+        self.assertEqual(len(iterative_scan_calls()), 1)
+        self.assertIn("strict_order", render(iterative_scan_calls()[0]))
+
+        # Unfiltered searches and older pgvector versions leave it alone
+        self.mock_cursor.execute.reset_mock()
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2)
+        self.assertEqual(iterative_scan_calls(), [])
+
+        pgvector.pgvector_version = (0, 7)
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2, filters={"user_id": "alice"})
+        self.assertEqual(iterative_scan_calls(), [])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
+    def test_transaction_on_autocommit_connection_psycopg2(self):
+        """Test that search settings get an explicit transaction on psycopg2 autocommit connections."""
+        cursor = MagicMock()
+        cursor.connection.autocommit = True
+        with PGVector._transaction(cursor):
+            self.assertFalse(cursor.connection.autocommit)
+        cursor.connection.commit.assert_called_once()
+        self.assertTrue(cursor.connection.autocommit)
+
+        # Failures roll back and restore autocommit
+        cursor = MagicMock()
+        cursor.connection.autocommit = True
+        with self.assertRaises(RuntimeError):
+            with PGVector._transaction(cursor):
+                raise RuntimeError("boom")
+        cursor.connection.rollback.assert_called_once()
+        cursor.connection.commit.assert_not_called()
+        self.assertTrue(cursor.connection.autocommit)
+
+        # Connections already in a transaction are left to _get_cursor
+        cursor = MagicMock()
+        cursor.connection.autocommit = False
+        with PGVector._transaction(cursor):
+            pass
+        cursor.connection.commit.assert_not_called()
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_prepared_statements_and_pipeline_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that psycopg3 prepares hot-path statements and pipelines multi-statement searches."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+        self.mock_cursor.fetchone.return_value = (self.test_ids[0], {"key": "value1"})
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            hnsw_ef_search=100,
+        )
+
+        pgvector.get(self.test_ids[0])
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertEqual(query.as_string(None), 'SELECT id, payload FROM "test_collection" WHERE id = %s')
+        self.assertEqual(params, (self.test_ids[0],))
+        self.assertEqual(self.mock_cursor.execute.call_args[1], {"prepare": True, "binary": False})
+
+        self.mock_cursor.execute.reset_mock()
+        self.mock_cursor.fetchall.return_value = [(self.test_ids[0], 0.1, {"key": "value1"})]
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2)
+        self.mock_cursor.connection.pipeline.assert_called_once()
+        for call in self.mock_cursor.execute.call_args_list:
+            self.assertTrue(call[1]["prepare"])
+        # The result rows of the search itself are requested in binary format
+        self.assertTrue(self.mock_cursor.execute.call_args[1]["binary"])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_search_raw_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that search_raw returns ids, a numpy score array and payloads column-wise."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4,
+        )
+
+        self.mock_cursor.fetchall.return_value = [
+            (uuid.UUID(self.test_ids[0]), 0.1, {"key": "value1"}),
+            (uuid.UUID(self.test_ids[1]), 0.2, {"key": "value2"}),
+        ]
+        ids, scores, payloads = pgvector.search_raw("test query", [0.1, 0.2, 0.3], limit=2)
+
+        self.assertEqual(ids, self.test_ids)
+        self.assertIsInstance(scores, np.ndarray)
+        np.testing.assert_allclose(scores, [0.1, 0.2])
+        self.assertEqual(payloads, [{"key": "value1"}, {"key": "value2"}])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_search_batch_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that search_batch runs all queries in one LATERAL join and groups results per query."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            minconn=1,
+            maxconn=4,
+        )
+
+        self.mock_cursor.execute.reset_mock()
+        self.mock_cursor.fetchall.return_value = [
+            (0, uuid.UUID(self.test_ids[0]), 0.1, {"key": "value1"}),
+            (0, uuid.UUID(self.test_ids[1]), 0.3, {"key": "value2"}),
+            (2, uuid.UUID(self.test_ids[1]), 0.2, {"key": "value2"}),
+        ]
+        queries = [[0.1, 0.2, 0.3], [0.9, 0.9, 0.9], [0.4, 0.5, 0.6]]
+        with patch('mem0.vector_stores.pgvector.Json', side_effect=lambda obj, dumps=None: obj):
+            results = pgvector.search_batch(queries, limit=2, filters={"user_id": "alice"})
+
+        search_calls = [call for call in self.mock_cursor.execute.call_args_list
+                        if "CROSS JOIN LATERAL" in render(call)]
+        self.assertEqual(len(search_calls), 1)
+        query, params = search_calls[0][0]
+        query = query.as_string(None)
+        self.assertIn("unnest(%s::vector[], %s::int[])", query)
+        self.assertIn("payload @> %s::jsonb", query)
+        self.assertEqual(len(params[0]), 3)
+        self.assertEqual(params[1:], ([0, 1, 2], {"user_id": "alice"}, 2))
+        self.mock_cursor.connection.transaction.assert_called()
+
+        self.assertEqual([[r.id for r in rs] for rs in results], [self.test_ids, [], [self.test_ids[1]]])
+        self.assertEqual(results[0][1].score, 0.3)
+        self.assertEqual(pgvector.search_batch([], limit=2), [])
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_no_prepared_statements_psycopg2(self, mock_get_cursor, mock_connection_pool):
+        """Test that psycopg2 executes statements without the psycopg3-only prepare/pipeline features."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+
+        pgvector.delete(self.test_ids[0])
+        query, params = self.mock_cursor.execute.call_args[0]
+        self.assertEqual(query.as_string(None), 'DELETE FROM "test_collection" WHERE id = %s')
+        self.assertEqual(params, (self.test_ids[0],))
+        self.assertEqual(self.mock_cursor.execute.call_args[1], {})
+        self.mock_cursor.connection.pipeline.assert_not_called()
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_halfvec_storage_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that halfvec storage uses the halfvec column type, operator class and query cast."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+            storage_type="halfvec",
+        )
+
+        table_calls = [call for call in self.mock_cursor.execute.call_args_list
+                       if 'CREATE TABLE IF NOT EXISTS "test_collection"' in render(call)]
+        self.assertIn("vector halfvec(3)", render(table_calls[0]))
+        hnsw_calls = [call for call in self.mock_cursor.execute.call_args_list
+                      if "USING hnsw" in render(call)]
+        self.assertIn("halfvec_cosine_ops", render(hnsw_calls[0]))
+
+        pgvector.search("test query", [0.1, 0.2, 0.3], limit=2)
+        search_calls = [call for call in self.mock_cursor.execute.call_args_list
+                        if "SELECT id, vector <=" in render(call)]
+        self.assertIn("%s::halfvec", render(search_calls[0]))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_create_col_payload_gin_index_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that collection creation adds a GIN index on the payload."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+        PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+
+        gin_calls = [call for call in self.mock_cursor.execute.call_args_list
+                     if "USING gin (payload jsonb_path_ops)" in render(call)]
+        self.assertEqual(len(gin_calls), 1)
+        self.assertIn("test_collection_payload_gin_idx", str(gin_calls[0]))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_create_partial_index_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test partial HNSW index creation for a payload key/value pair."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = [("test_collection",)]
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+        pgvector.create_partial_index("user_id", "o'brien")
+
+        query = self.mock_cursor.execute.call_args[0][0].as_string(None)
+        self.assertIn('CREATE INDEX IF NOT EXISTS "test_collection_hnsw_', query)
+        self.assertIn('ON "test_collection"', query)
+        self.assertIn("USING hnsw (vector vector_cosine_ops)", query)
+        self.assertIn('WHERE payload @> \'{"user_id": "o\'\'brien"}\'::jsonb', query)
+
+        # Different values get different index names
+        pgvector.create_partial_index("user_id", "alice")
+        other_query = self.mock_cursor.execute.call_args[0][0].as_string(None)
+        self.assertNotEqual(query.split()[5], other_query.split()[5])
+
+        # Long collection names must not truncate the digest out of the index name
+        pgvector._table_name = "c" * 60
+        names = set()
+        for value in ("alice", "bob"):
+            pgvector.create_partial_index("user_id", value)
+            name = self.mock_cursor.execute.call_args[0][0].as_string(None).split()[5].strip('"')
+            self.assertLessEqual(len(name.encode()), 63)
+            names.add(name)
+        self.assertEqual(len(names), 2)
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_collection_name_quoted_psycopg3(self, mock_get_cursor, mock_connection_pool):
+        """Test that collection names are quoted and folded to lower case in SQL."""
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = self.mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        self.mock_cursor.fetchall.return_value = []
+
+        PGVector(
+            dbname="test_db",
+            collection_name="Team-Memories",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertTrue(any('CREATE TABLE IF NOT EXISTS "team-memories"' in q for q in queries))
+        self.assertTrue(any('CREATE INDEX IF NOT EXISTS "team-memories_hnsw_idx"' in q for q in queries))
+
+        # An existing collection is found under its folded name and not recreated
+        self.mock_cursor.execute.reset_mock()
+        self.mock_cursor.fetchall.return_value = [("team-memories",)]
+        PGVector(
+            dbname="test_db",
+            collection_name="Team-Memories",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=True,
+            minconn=1,
+            maxconn=4,
+        )
+        queries = [render(call) for call in self.mock_cursor.execute.call_args_list]
+        self.assertFalse(any("CREATE TABLE" in q or "CREATE INDEX" in q for q in queries))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    def test_invalid_storage_type(self, mock_connection_pool):
+        """Test that an unknown storage type is rejected."""
+        with self.assertRaises(ValueError):
+            PGVector(
+                dbname="test_db",
+                collection_name="test_collection",
+                embedding_model_dims=3,
+                user="test_user",
+                password="test_pass",
+                host="localhost",
+                port=5432,
+                diskann=False,
+                hnsw=True,
+                storage_type="bit",
+            )
+        mock_connection_pool.assert_not_called()
+
+    # Enhanced Test for Pool Cleanup
+    def test_pool_cleanup_psycopg3(self):
+        """Test that psycopg3 pool is properly closed when the store is closed."""
+        with patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3), \
+             patch('mem0.vector_stores.pgvector.ConnectionPool') as mock_connection_pool:
+            
+            mock_pool = MagicMock()
+            mock_connection_pool.return_value = mock_pool
+            self.mock_cursor.fetchall.return_value = []  # No existing collections
+            
+            pgvector = PGVector(
+                dbname="test_db",
+                collection_name="test_collection",
+                embedding_model_dims=3,
+                user="test_user",
+                password="test_pass",
+                host="localhost",
+                port=5432,
+                diskann=False,
+                hnsw=False,
+                minconn=1,
+                maxconn=4
+            )
+            
+            pgvector.close()
+
+            # Verify pool.close() was called
+            mock_pool.close.assert_called_once()
+
+            # Closing again is a no-op
+            pgvector.close()
+            mock_pool.close.assert_called_once()
+
+    def test_pool_cleanup_psycopg2(self):
+        """Test that psycopg2 pool is properly closed when leaving a with block."""
+        with patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 2), \
+             patch('mem0.vector_stores.pgvector.ConnectionPool') as mock_connection_pool:
+            
+            mock_pool = MagicMock()
+            mock_connection_pool.return_value = mock_pool
+            self.mock_cursor.fetchall.return_value = []  # No existing collections
+            
+            with PGVector(
+                dbname="test_db",
+                collection_name="test_collection",
+                embedding_model_dims=3,
+                user="test_user",
+                password="test_pass",
+                host="localhost",
+                port=5432,
+                diskann=False,
+                hnsw=False,
+                minconn=1,
+                maxconn=4
+            ) as pgvector:
+                self.assertIsInstance(pgvector, PGVector)
+                mock_pool.closeall.assert_not_called()
+
+            # Verify pool.closeall() was called
+            mock_pool.closeall.assert_called_once()
+
+    def test_pool_closed_at_exit(self):
+        """Test that the pool of a live instance is closed at interpreter exit."""
+        with patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3), \
+             patch('mem0.vector_stores.pgvector.ConnectionPool') as mock_connection_pool:
+
+            mock_pool = MagicMock()
+            mock_connection_pool.return_value = mock_pool
+            self.mock_cursor.fetchall.return_value = []  # No existing collections
+
+            def make_store():
+                return PGVector(
+                    dbname="test_db",
+                    collection_name="test_collection",
+                    embedding_model_dims=3,
+                    user="test_user",
+                    password="test_pass",
+                    host="localhost",
+                    port=5432,
+                    diskann=False,
+                    hnsw=False,
+                    minconn=1,
+                    maxconn=4
+                )
+
+            pgvector = make_store()
+            self.assertIn(pgvector, pgvector_module._open_stores)
+            pgvector_module._close_open_stores()
+            mock_pool.close.assert_called_once()
+            self.assertNotIn(pgvector, pgvector_module._open_stores)
+
+            # Closed and collected instances are dropped from the registry
+            closed = make_store()
+            closed.close()
+            self.assertNotIn(closed, pgvector_module._open_stores)
+            collected = make_store()
+            collected_ref = weakref.ref(collected)
+            del collected
+            self.assertIsNone(collected_ref())
+
+    def tearDown(self):
+        """Clean up after each test."""
+        pass
+
+
+class TestSemanticQueryCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SemanticQueryCache(max_size=2, threshold=0.99)
+        self.results = [OutputData(id="id1", score=0.1, payload={"user_id": "alice"})]
+
+    def test_hit_on_similar_query(self):
+        """Test that a near-identical query returns the cached results."""
+        self.cache.put([1.0, 0.0, 0.0], 5, {"user_id": "alice"}, self.results)
+
+        cached = self.cache.get([1.0, 0.01, 0.0], 5, {"user_id": "alice"})
+
+        self.assertEqual(cached, self.results)
+
+    def test_miss_on_dissimilar_query(self):
+        """Test that a query below the similarity threshold misses."""
+        self.cache.put([1.0, 0.0, 0.0], 5, None, self.results)
+
+        self.assertIsNone(self.cache.get([0.0, 1.0, 0.0], 5, None))
+
+    def test_miss_on_different_limit_or_filters(self):
+        """Test that cached results are only reused for the same limit and filters."""
+        self.cache.put([1.0, 0.0, 0.0], 5, {"user_id": "alice"}, self.results)
+
+        self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 10, {"user_id": "alice"}))
+        self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 5, {"user_id": "bob"}))
+        self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 5, None))
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted when the cache is full."""
+        self.cache.put([1.0, 0.0, 0.0], 5, None, self.results)
+        self.cache.put([0.0, 1.0, 0.0], 5, None, self.results)
+        self.cache.get([1.0, 0.0, 0.0], 5, None)  # Touch the first entry
+
+        self.cache.put([0.0, 0.0, 1.0], 5, None, self.results)
+
+        self.assertIsNotNone(self.cache.get([1.0, 0.0, 0.0], 5, None))
+        self.assertIsNone(self.cache.get([0.0, 1.0, 0.0], 5, None))
+        self.assertIsNotNone(self.cache.get([0.0, 0.0, 1.0], 5, None))
+
+    def test_scopes_bounded_by_cached_entries(self):
+        """Test that lookups do not register scopes and evicted scopes are forgotten."""
+        for i in range(100):
+            self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 5, {"user_id": f"user{i}"}))
+        self.assertEqual(len(self.cache._scopes), 0)
+
+        for i in range(100):
+            self.cache.put([1.0, 0.0, 0.0], 5, {"user_id": f"user{i}"}, self.results)
+        self.assertEqual(len(self.cache._scopes), 2)
+        self.assertIsNotNone(self.cache.get([1.0, 0.0, 0.0], 5, {"user_id": "user99"}))
+        self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 5, {"user_id": "user0"}))
+
+    def test_put_dropped_after_clear(self):
+        """Test that results read before a clear() are not cached after it."""
+        generation = self.cache.generation
+        self.cache.clear()  # A concurrent write lands between the database read and put()
+        self.cache.put([1.0, 0.0, 0.0], 5, None, self.results, generation=generation)
+        self.assertIsNone(self.cache.get([1.0, 0.0, 0.0], 5, None))
+
+        self.cache.put([1.0, 0.0, 0.0], 5, None, self.results, generation=self.cache.generation)
+        self.assertIsNotNone(self.cache.get([1.0, 0.0, 0.0], 5, None))
+
+    @patch('mem0.vector_stores.pgvector.time.monotonic')
+    def test_entries_expire_after_max_age(self, mock_monotonic):
+        """Test that entries older than max_age miss."""
+        cache = SemanticQueryCache(max_size=2, threshold=0.99, max_age=60)
+        mock_monotonic.return_value = 1000.0
+        cache.put([1.0, 0.0, 0.0], 5, None, self.results)
+
+        mock_monotonic.return_value = 1059.0
+        self.assertIsNotNone(cache.get([1.0, 0.0, 0.0], 5, None))
+        mock_monotonic.return_value = 1061.0
+        self.assertIsNone(cache.get([1.0, 0.0, 0.0], 5, None))
+
+    def test_unset_threshold_uses_default(self):
+        """Test that threshold=None falls back to the default instead of failing on lookup."""
+        cache = SemanticQueryCache(max_size=2, threshold=None)
+        cache.put([1.0, 0.0, 0.0], 5, None, self.results)
+
+        self.assertEqual(cache.threshold, 0.99)
+        self.assertIsNotNone(cache.get([1.0, 0.01, 0.0], 5, None))
+        self.assertIsNone(cache.get([0.0, 1.0, 0.0], 5, None))
+
+    @patch('mem0.vector_stores.pgvector.PSYCOPG_VERSION', 3)
+    @patch('mem0.vector_stores.pgvector.ConnectionPool')
+    @patch.object(PGVector, '_get_cursor')
+    def test_pgvector_search_uses_cache_until_write(self, mock_get_cursor, mock_connection_pool):
+        """Test that PGVector.search serves repeated queries from the cache and drops it on writes."""
+        mock_cursor = MagicMock()
+        mock_connection_pool.return_value = MagicMock()
+        mock_get_cursor.return_value.__enter__.return_value = mock_cursor
+        mock_get_cursor.return_value.__exit__.return_value = None
+        mock_cursor.fetchall.return_value = []
+
+        pgvector = PGVector(
+            dbname="test_db",
+            collection_name="test_collection",
+            embedding_model_dims=3,
+            user="test_user",
+            password="test_pass",
+            host="localhost",
+            port=5432,
+            diskann=False,
+            hnsw=False,
+            query_cache_size=8,
+        )
+        mock_cursor.fetchall.return_value = [("id1", 0.1, {"user_id": "alice"})]
+
+        def search_queries():
+            return [call for call in mock_cursor.execute.call_args_list if "SELECT id, vector <=" in render(call)]
+
+        first = pgvector.search("q", [0.1, 0.2, 0.3], limit=1)
+        second = pgvector.search("q", [0.1, 0.2, 0.3001], limit=1)
+        self.assertEqual(len(search_queries()), 1)
+        self.assertEqual(first, second)
+
+        pgvector.delete("id1")
+        pgvector.search("q", [0.1, 0.2, 0.3], limit=1)
+        self.assertEqual(len(search_queries()), 2)
+
+        # A write committed while a search is reading must not leave its pre-write rows cached
+        search_rows = pgvector._search_rows
+
+        def search_rows_with_concurrent_write(*args):
+            rows = search_rows(*args)
+            pgvector._invalidate_query_cache()
+            return rows
+
+        pgvector.query_cache.clear()
+        with patch.object(pgvector, "_search_rows", side_effect=search_rows_with_concurrent_write):
+            pgvector.search("q", [0.1, 0.2, 0.3], limit=1)
+        pgvector.search("q", [0.1, 0.2, 0.3], limit=1)
+        self.assertEqual(len(search_queries()), 4)